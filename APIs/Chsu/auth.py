@@ -0,0 +1,92 @@
+import asyncio
+import base64
+import json
+from asyncio import AbstractEventLoop
+from time import time
+
+from Wrappers.AIOHttp.aiohttp import AIOHttpWrapper
+
+
+class ChsuAuth:
+    def __init__(
+            self,
+            client: AIOHttpWrapper,
+            base_url: str,
+            login_and_password: dict,
+            headers: dict,
+            event_loop: AbstractEventLoop,
+            default_lifetime: float = 59 * 60,
+            refresh_margin: float = 5 * 60
+    ):
+        self._client = client
+        self._base_url = base_url
+        self._login_and_password = login_and_password
+        self._headers = dict(headers)
+        self._default_lifetime = default_lifetime
+        self._refresh_margin = refresh_margin
+        self._token = None
+        self._expires_at = 0.0
+        self._refreshing = None
+        self._signins = 0
+        self._replays = 0
+        event_loop.create_task(self._refreshing_token())
+
+    def get_status(self) -> dict:
+        return {
+            "authorized": self._token is not None,
+            "expires in": max(round(self._expires_at - time()), 0),
+            "signins": self._signins,
+            "replays": self._replays
+        }
+
+    async def get(self, url: str, params: dict = None):
+        token = await self._get_token()
+        response = await self._client.get(url, headers=self._get_headers(token), params=params)
+        if isinstance(response, dict) and response.get('code') == 401:
+            self._replays += 1
+            token = await self._refresh(token)
+            response = await self._client.get(url, headers=self._get_headers(token), params=params)
+        return response
+
+    async def sign_in(self) -> dict:
+        return await self._client.post(f"{self._base_url}auth/signin", self._login_and_password, self._headers)
+
+    async def _refreshing_token(self):
+        while True:
+            try:
+                await asyncio.sleep(max(self._expires_at - self._refresh_margin - time(), 0))
+                await self._refresh(self._token)
+            except Exception as err:
+                print(f"{err.__class__.__name__}: {err}")
+                await asyncio.sleep(5)
+
+    async def _get_token(self) -> str:
+        if self._token is None or time() >= self._expires_at:
+            return await self._refresh(self._token)
+        return self._token
+
+    async def _refresh(self, stale_token: str = None) -> str:
+        if self._token is not None and self._token != stale_token:
+            return self._token
+        if self._refreshing is None or self._refreshing.done():
+            self._refreshing = asyncio.ensure_future(self._update_token())
+        return await asyncio.shield(self._refreshing)
+
+    async def _update_token(self) -> str:
+        response = await self.sign_in()
+        if 'data' not in response:
+            raise ConnectionError(f"{response.get('code')}: {response.get('description')}")
+        self._signins += 1
+        self._expires_at = self._get_expiration(response['data'])
+        self._token = response['data']
+        return self._token
+
+    def _get_expiration(self, token: str) -> float:
+        try:
+            payload = token.split(".")[1]
+            return float(json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))["exp"])
+        except (IndexError, KeyError, TypeError, ValueError):
+            return time() + self._default_lifetime
+
+    def _get_headers(self, token: str) -> dict:
+        return {**self._headers, "Authorization": f"Bearer {token}"}
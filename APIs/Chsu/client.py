@@ -1,15 +1,19 @@
 import asyncio
-import hashlib
 from asyncio import AbstractEventLoop
-from datetime import datetime
+from datetime import datetime, timedelta
 
+from APIs.Chsu.auth import ChsuAuth
+from APIs.Chsu.directory_snapshot import DirectorySnapshot
+from APIs.Chsu.name_index import NameIndex
 from APIs.Chsu.schedule import Schedule
+from APIs.Chsu.schedule_store import ScheduleStore
 from Wrappers.AIOHttp.aiohttp import AIOHttpWrapper
+from Wrappers.Cache.ttl_cache import TTLCache
 from Exceptions.empty_response import EmptyResponse
 
 
 class Chsu:
-    def __init__(self, event_loop: AbstractEventLoop):
+    def __init__(self, event_loop: AbstractEventLoop, snapshot_path: str = "chsu_directory.json"):
         self._client = AIOHttpWrapper(event_loop)
         self._base_url = "http://api.chsu.ru/api/"
         self._headers = {
@@ -22,33 +26,31 @@ class Chsu:
         }
         self._id_by_professors = None
         self._id_by_groups = None
-        event_loop.create_task(self._updating_token())
+        self._name_index = NameIndex()
+        self._directory_version = None
+        self._directory_refresh = None
+        self._directory_snapshot = DirectorySnapshot(snapshot_path)
+        self._load_directory_snapshot()
+        self._timetable_cache = TTLCache(
+            max_size=4096, ttl=10 * 60, stale_ttl=30 * 60, stale_if_error=6 * 60 * 60
+        )
+        self._schedule_store = ScheduleStore()
+        self._auth = ChsuAuth(self._client, self._base_url, self._login_and_password, self._headers, event_loop)
+        event_loop.create_task(self._updating_directory())
 
-    async def _updating_token(self):
+    async def _updating_directory(self):
         while True:
             try:
-                self._headers.pop("Authorization", '')
-                response = await self._client.post(
-                    f"{self._base_url}auth/signin",
-                    self._login_and_password,
-                    self._headers
-                )
-                if 'data' in response:
-                    self._headers["Authorization"] = f'''Bearer {response['data']}'''
-                    await self._refresh_groups_list()
-                    await self._refresh_professors_list()
-                    await asyncio.sleep(59 * 60)
-                    continue
-                else:
-                    print(response)
+                await self._refresh_directory()
+                await asyncio.sleep(59 * 60)
+                continue
             except Exception as err:
                 print(f"{err.__class__.__name__}: {err}")
-            finally:
-                await asyncio.sleep(5)
+            await asyncio.sleep(5)
 
     async def get_status(self):
         try:
-            response = await self._client.post(f"{self._base_url}auth/signin", self._login_and_password, self._headers)
+            response = await self._auth.sign_in()
             if 'description' in response:
                 return f"{response['code']}: {response['description']}"
             else:
@@ -56,70 +58,149 @@ class Chsu:
         except Exception as err:
             return f"{err.__class__.__name__}: {err}"
 
+    def get_auth_status(self) -> dict:
+        return self._auth.get_status()
+
+    def get_http_status(self) -> dict:
+        return self._client.get_status()
+
+    def get_cache_status(self):
+        return {
+            "timetable cache": self._timetable_cache.get_status(),
+            "schedule store": self._schedule_store.get_status(),
+            "directory version": self._directory_version
+        }
+
     async def get_user_type(self, name: str):
-        if name in (await self._get_id_by_professors_list()).keys():
-            return "professor"
-        elif name in (await self._get_id_by_groups_list()).keys():
-            return "student"
-        else:
+        return (await self._find_name(name))[1]
+
+    async def get_canonical_name(self, name: str):
+        return (await self._find_name(name))[0]
+
+    def get_name_suggestions(self, name: str, limit: int = 5) -> list:
+        return self._name_index.get_suggestions(name, limit)
+
+    async def _find_name(self, name: str) -> tuple:
+        await self._get_id_by_groups_list()
+        await self._get_id_by_professors_list()
+        entry = self._name_index.find(name)
+        if entry is None:
             raise EmptyResponse(f"{name} not in groups/professors list.")
+        return entry
 
     async def _get_id_by_professors_list(self):
         if self._id_by_professors is None:
-            await self._refresh_professors_list()
+            await self._refresh_directory()
         return self._id_by_professors
 
-    async def _refresh_professors_list(self):
-        teachers = await self._client.get(self._base_url + "/teacher/v1", headers=self._headers)
-        self._id_by_professors = {}
-        for teacher in teachers:
-            self._id_by_professors[teacher["fio"]] = teacher['id']
-
     async def _get_id_by_groups_list(self):
         if self._id_by_groups is None:
-            await self._refresh_groups_list()
+            await self._refresh_directory()
         return self._id_by_groups
 
-    async def _refresh_groups_list(self):
-        groups = await self._client.get(self._base_url + "/group/v1", headers=self._headers)
-        self._id_by_groups = {}
-        for group in groups:
-            self._id_by_groups[group["title"]] = group['id']
-
-    async def get_schedule_list_hash(self, name: str, start_date: str, last_date: str = None):
-        return list(
-            map(
-                lambda schedule: {
-                    "time": datetime.strptime(schedule['text'].split(', ')[1][0:10], "%d.%m.%Y"),
-                    "hash": hashlib.sha256(schedule['text'].encode()).hexdigest()
-                }, filter(
-                    lambda schedule: len(schedule['text'].split(', ')) > 1,
-                    await self.get_schedule_list_string(name, start_date, last_date)
-                )
-            )
+    def _load_directory_snapshot(self):
+        snapshot = self._directory_snapshot.load()
+        if snapshot is not None:
+            self._set_directory(snapshot["groups"], snapshot["professors"], snapshot["version"])
+
+    async def _refresh_directory(self):
+        if self._directory_refresh is None or self._directory_refresh.done():
+            self._directory_refresh = asyncio.ensure_future(self._download_directory())
+        await asyncio.shield(self._directory_refresh)
+
+    async def _download_directory(self):
+        groups, teachers = await asyncio.gather(
+            self._auth.get(self._base_url + "/group/v1"),
+            self._auth.get(self._base_url + "/teacher/v1")
         )
+        id_by_groups = {group["title"]: group['id'] for group in groups}
+        id_by_professors = {teacher["fio"]: teacher['id'] for teacher in teachers}
+        version = DirectorySnapshot.get_version(id_by_groups, id_by_professors)
+        if version != self._directory_version:
+            self._set_directory(id_by_groups, id_by_professors, version)
+            self._directory_snapshot.save(id_by_groups, id_by_professors)
+
+    def _set_directory(self, id_by_groups: dict, id_by_professors: dict, version: str):
+        self._id_by_groups = id_by_groups
+        self._id_by_professors = id_by_professors
+        self._name_index = NameIndex(id_by_groups, id_by_professors)
+        self._directory_version = version
 
     async def get_schedule_list_string(self, name: str, start_date: str, last_date: str = None):
-        return Schedule(
+        schedule = self._schedule_store.get(name, start_date, last_date)
+        if schedule is None:
+            schedule = Schedule(
+                await self.get_user_type(name),
+                *await self._get_schedule_json(name, start_date, last_date)
+            )
+        return schedule
+
+    async def update_schedule_store(self, name: str, start_date: str, last_date: str = None):
+        schedule = Schedule(
             await self.get_user_type(name),
-            await self._get_schedule_json(name, start_date, last_date)
+            (await self._get_schedule_json(name, start_date, last_date, refresh=True))[0]
         )
+        self._schedule_store.update(name, schedule, start_date, last_date)
+        return schedule
 
-    async def _get_schedule_json(self, name: str, start_date: str, last_date: str = None):
-        response = await self._client.get(
+    async def update_schedule_store_bulk(self, start_date: str, last_date: str, shard_days: int = 7) -> dict:
+        couples = await self._get_bulk_schedule_json(start_date, last_date, shard_days)
+        if not couples:
+            raise ConnectionError("Bulk timetable response is empty.")
+        couples_by_id = self._partition_couples(couples)
+        schedules = {}
+        for id_type, id_by_names in (
+                ("student", await self._get_id_by_groups_list()),
+                ("professor", await self._get_id_by_professors_list())
+        ):
+            for name, chsu_id in id_by_names.items():
+                if (id_type, chsu_id) in couples_by_id:
+                    schedules[name] = Schedule(id_type, couples_by_id[(id_type, chsu_id)])
+                    self._schedule_store.update(name, schedules[name], start_date, last_date)
+        return schedules
+
+    async def _get_bulk_schedule_json(self, start_date: str, last_date: str, shard_days: int):
+        shards = []
+        shard_start = datetime.strptime(start_date, "%d.%m.%Y")
+        final_date = datetime.strptime(last_date, "%d.%m.%Y")
+        while shard_start <= final_date:
+            shard_end = min(shard_start + timedelta(days=shard_days - 1), final_date)
+            shards.append(self._request_schedule_json(shard_start.strftime("%d.%m.%Y"), shard_end.strftime("%d.%m.%Y")))
+            shard_start = shard_end + timedelta(days=1)
+        return [couple for shard in await asyncio.gather(*shards) for couple in shard]
+
+    @staticmethod
+    def _partition_couples(couples: list) -> dict:
+        couples_by_id = {}
+        for couple in sorted(
+                couples,
+                key=lambda c: (datetime.strptime(c['dateEvent'], "%d.%m.%Y"), c['startTime'])
+        ):
+            for group in couple['groups']:
+                couples_by_id.setdefault(("student", group['id']), []).append(couple)
+            for lecturer in couple['lecturers']:
+                couples_by_id.setdefault(("professor", lecturer['id']), []).append(couple)
+        return couples_by_id
+
+    async def _get_schedule_json(self, name: str, start_date: str, last_date: str = None, refresh: bool = False):
+        id_type = (await self.get_user_type(name)).replace('student', 'groupId').replace('professor', 'lecturerId')
+        chsu_id = await self._get_chsu_id(name)
+        key = (id_type, chsu_id, start_date, last_date or start_date)
+        loader = lambda: self._request_schedule_json(start_date, last_date or start_date, f"{id_type}/{chsu_id}/")
+        if refresh:
+            return await self._timetable_cache.refresh(key, loader), None
+        return await self._timetable_cache.get_or_load_with_age(key, loader)
+
+    async def _request_schedule_json(self, start_date: str, last_date: str, entity_path: str = ""):
+        response = await self._auth.get(
             f"{self._base_url}/timetable/v1/"
             f"from/{start_date}/"
-            f"to/{last_date or start_date}/"
-            f"{(await self.get_user_type(name)).replace('student', 'groupId').replace('professor', 'lecturerId')}/"
-            f"{await self._get_chsu_id(name)}/",
-            headers=self._headers
+            f"to/{last_date}/"
+            f"{entity_path}"
         )
         if 'description' in response:
             raise ConnectionError(f"{response['code']}: {response['description']}")
         return response
 
     async def _get_chsu_id(self, name: str):
-        return {
-            **(await self._get_id_by_groups_list()),
-            **(await self._get_id_by_professors_list())
-        }[name]
+        return (await self._find_name(name))[2]
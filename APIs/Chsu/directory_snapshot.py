@@ -0,0 +1,40 @@
+import hashlib
+import json
+import os
+from datetime import datetime
+
+
+class DirectorySnapshot:
+    def __init__(self, path: str):
+        self._path = path
+
+    @staticmethod
+    def get_version(id_by_groups: dict, id_by_professors: dict) -> str:
+        return hashlib.sha256(
+            json.dumps([id_by_groups, id_by_professors], ensure_ascii=False, sort_keys=True).encode()
+        ).hexdigest()
+
+    def load(self):
+        try:
+            with open(self._path, encoding="utf-8") as file:
+                snapshot = json.load(file)
+            return snapshot if {"version", "saved_at", "groups", "professors"} <= snapshot.keys() else None
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as err:
+            print(f"{err.__class__.__name__}: {err}")
+            return None
+
+    def save(self, id_by_groups: dict, id_by_professors: dict) -> None:
+        temporary_path = f"{self._path}.tmp"
+        try:
+            with open(temporary_path, "w", encoding="utf-8") as file:
+                json.dump({
+                    "version": self.get_version(id_by_groups, id_by_professors),
+                    "saved_at": datetime.now().isoformat(),
+                    "groups": id_by_groups,
+                    "professors": id_by_professors
+                }, file, ensure_ascii=False, separators=(",", ":"))
+            os.replace(temporary_path, self._path)
+        except OSError as err:
+            print(f"{err.__class__.__name__}: {err}")
@@ -0,0 +1,64 @@
+from bisect import bisect_left
+
+
+class NameIndex:
+    def __init__(self, id_by_groups: dict = None, id_by_professors: dict = None):
+        self._entries = {}
+        for id_type, id_by_names in (("student", id_by_groups or {}), ("professor", id_by_professors or {})):
+            for name, chsu_id in id_by_names.items():
+                self._entries[self.normalize(name)] = (name, id_type, chsu_id)
+        self._sorted_keys = sorted(self._entries.keys())
+        self._keys_by_trigram = {}
+        self._trigrams_count = {}
+        for key in self._entries.keys():
+            trigrams = self._get_trigrams(key)
+            self._trigrams_count[key] = len(trigrams)
+            for trigram in trigrams:
+                self._keys_by_trigram.setdefault(trigram, set()).add(key)
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return " ".join(text.casefold().replace("ё", "е").split())
+
+    def find(self, text: str):
+        return self._entries.get(self.normalize(text))
+
+    def get_suggestions(self, text: str, limit: int = 5, min_similarity: float = 0.3) -> list:
+        key = self.normalize(text)
+        if not key:
+            return []
+        suggestions = self._get_prefix_matches(key, limit)
+        if len(suggestions) < limit:
+            suggestions += [
+                similar_key for similar_key in self._get_similar_keys(key, min_similarity)
+                if similar_key not in suggestions
+            ][:limit - len(suggestions)]
+        return [self._entries[suggestion][0] for suggestion in suggestions]
+
+    def _get_prefix_matches(self, prefix: str, limit: int) -> list:
+        matches = []
+        index = bisect_left(self._sorted_keys, prefix)
+        while index < len(self._sorted_keys) and len(matches) < limit and \
+                self._sorted_keys[index].startswith(prefix):
+            matches.append(self._sorted_keys[index])
+            index += 1
+        return matches
+
+    def _get_similar_keys(self, key: str, min_similarity: float) -> list:
+        trigrams = self._get_trigrams(key)
+        shared_by_key = {}
+        for trigram in trigrams:
+            for candidate in self._keys_by_trigram.get(trigram, ()):
+                shared_by_key[candidate] = shared_by_key.get(candidate, 0) + 1
+        similarities = []
+        for candidate, shared in shared_by_key.items():
+            containment = shared / len(trigrams)
+            if containment >= min_similarity:
+                jaccard = shared / (len(trigrams) + self._trigrams_count[candidate] - shared)
+                similarities.append((containment, jaccard, candidate))
+        return [candidate for *_, candidate in sorted(similarities, key=lambda s: (-s[0], -s[1], s[2]))]
+
+    @staticmethod
+    def _get_trigrams(key: str) -> set:
+        padded = f"  {key} "
+        return {padded[index:index + 3] for index in range(len(padded) - 2)}
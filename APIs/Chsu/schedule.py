@@ -2,22 +2,46 @@ import datetime
 
 
 class Schedule:
-    def __init__(self, id_type: str, json: list):
+    def __init__(self, id_type: str, json: list, stale_age: float = None):
         self._nullify_fields()
         self._response_json = json
-        for self._couple in self._response_json:
+        self._stale_age = stale_age
+        for self._couple in map(dict, self._response_json):
             self._split_if_another_day()
             self._add_couple_to_string(id_type)
             self._delete_address_duplicates()
 
     def __iter__(self):
-        return (i for i in self._response or [{"text": "Расписание не найдено.\n", 'callback_data': []}])
+        days = self._response or [{"text": "Расписание не найдено.\n", 'callback_data': []}]
+        if self._stale_age is not None:
+            days = [{**days[0], "text": self._get_stale_note() + days[0]["text"]}] + days[1:]
+        return (i for i in days)
 
     def __hash__(self):
         return hash(self._response or [{"text": "Расписание не найдено.\n", 'callback_data': []}])
 
+    @classmethod
+    def from_days(cls, days_by_date: dict):
+        schedule = cls.__new__(cls)
+        schedule._nullify_fields()
+        schedule._dates = list(days_by_date.keys())
+        schedule._response = list(days_by_date.values())
+        return schedule
+
+    def get_couples(self) -> list:
+        return self._response_json
+
+    def get_days_by_date(self) -> dict:
+        return dict(zip(self._dates, self._response))
+
+    def get_stale_age(self):
+        return self._stale_age
+
     def _nullify_fields(self):
         self._response = []
+        self._response_json = []
+        self._dates = []
+        self._stale_age = None
         self._couple = {}
         self._current_date = datetime.datetime(1970, 1, 1)
 
@@ -30,6 +54,7 @@ class Schedule:
 
     def _update_current_and_add_day(self):
         self._current_date = datetime.datetime.strptime(self._couple['dateEvent'], "%d.%m.%Y")
+        self._dates.append(self._couple['dateEvent'])
         weekdays = ["Понедельник", "Вторник", "Среда", "Четверг", "Пятница", "Суббота", "Воскресение"]
         self._response.append({
             "text": f'\n=={weekdays[self._current_date.weekday()]}, {self._current_date.strftime("%d.%m.%Y")}==\n',
@@ -45,13 +70,15 @@ class Schedule:
             self._response[-1]["callback_data"].append(self._couple['build']['title'])
         self._response[-1]["text"] += "\n"
 
+    def _get_stale_note(self):
+        return f"Показано сохранённое расписание, полученное {max(round(self._stale_age / 60), 1)} мин. назад.\n"
+
     def _get_couple_time(self):
         return f"{self._couple['startTime']}-{self._couple['endTime']}\n"
 
     def _get_discipline_string(self):
-        if self._couple["abbrlessontype"]:
-            self._couple["abbrlessontype"] += "., "
-        return f'''{self._couple["abbrlessontype"] or ''}{self._couple['discipline']['title']}\n'''
+        lesson_type = f'{self._couple["abbrlessontype"]}., ' if self._couple["abbrlessontype"] else ''
+        return f"{lesson_type}{self._couple['discipline']['title']}\n"
 
     def _get_professors_names(self):
         response = ""
@@ -0,0 +1,124 @@
+import datetime
+from collections import Counter
+
+
+class ScheduleDiff:
+    def __init__(self, id_type: str):
+        self._id_type = id_type
+
+    @staticmethod
+    def get_fingerprints(couples: list, start_date: str, last_date: str) -> dict:
+        return {
+            "from": start_date,
+            "to": last_date,
+            "couples": [{
+                "date": couple['dateEvent'],
+                "start": couple['startTime'],
+                "end": couple['endTime'],
+                "type": couple['abbrlessontype'] or '',
+                "discipline": couple['discipline']['title'],
+                "build": couple['build']['title'] if couple['online'] != 1 else None,
+                "auditory": couple['auditory']['title'] if couple['online'] != 1 else None,
+                "online": couple['online'] == 1,
+                "lecturers": sorted(lecturer['fio'] for lecturer in couple['lecturers']),
+                "groups": sorted(group['title'] for group in couple['groups'])
+            } for couple in couples]
+        }
+
+    def get_messages(self, old_fingerprints: dict, new_fingerprints: dict) -> list:
+        if not old_fingerprints:
+            return []
+        messages = []
+        for date in self._get_common_dates(old_fingerprints, new_fingerprints):
+            added, removed, moved = self._get_day_changes(
+                self._get_day(old_fingerprints, date),
+                self._get_day(new_fingerprints, date)
+            )
+            if added or removed or moved:
+                messages.append(self._get_message(date, added, removed, moved))
+        return messages
+
+    def _get_day_changes(self, old_couples: list, new_couples: list) -> tuple:
+        old_keys = Counter(map(self._get_key, old_couples))
+        new_keys = Counter(map(self._get_key, new_couples))
+        removed = self._find_couples(old_couples, old_keys - new_keys)
+        added = self._find_couples(new_couples, new_keys - old_keys)
+        moved = []
+        for old_couple in list(removed):
+            new_couple = next((c for c in added if self._is_same_lesson(old_couple, c)), None)
+            if new_couple is not None:
+                removed.remove(old_couple)
+                added.remove(new_couple)
+                moved.append((old_couple, new_couple))
+        return added, removed, moved
+
+    def _get_message(self, date: str, added: list, removed: list, moved: list) -> tuple:
+        weekdays = ["Понедельник", "Вторник", "Среда", "Четверг", "Пятница", "Суббота", "Воскресение"]
+        text = f"Изменения в расписании на " \
+               f"{weekdays[datetime.datetime.strptime(date, '%d.%m.%Y').weekday()]}, {date}:\n"
+        for title, couples in (("Добавлено", added), ("Отменено", removed)):
+            if couples:
+                text += f"\n{title}:\n" + "".join(self._get_couple_string(couple) for couple in couples)
+        if moved:
+            text += "\nПеренесено:\n" + "".join(
+                f"{self._get_couple_string(old_couple)}→ "
+                f"{new_couple['start']}-{new_couple['end']}, {self._get_location_string(new_couple)}\n"
+                for old_couple, new_couple in moved
+            )
+        buildings = {
+            couple['build'] for couple in added + [new_couple for _, new_couple in moved] if couple['build']
+        }
+        return text, list(buildings)
+
+    def _get_couple_string(self, couple: dict) -> str:
+        names = couple['lecturers'] if self._id_type == 'student' else couple['groups']
+        lesson_type = f"{couple['type']}., " if couple['type'] else ''
+        return f"{couple['start']}-{couple['end']} {lesson_type}{couple['discipline']}\n" \
+               f"{', '.join(names)}\n" \
+               f"{self._get_location_string(couple)}\n"
+
+    @staticmethod
+    def _get_location_string(couple: dict) -> str:
+        return "Онлайн" if couple['online'] else f"{couple['build']}, аудитория {couple['auditory']}"
+
+    @staticmethod
+    def _is_same_lesson(old_couple: dict, new_couple: dict) -> bool:
+        return all(
+            old_couple[field] == new_couple[field]
+            for field in ("type", "discipline", "lecturers", "groups")
+        )
+
+    @classmethod
+    def _find_couples(cls, couples: list, keys: Counter) -> list:
+        found = []
+        for couple in couples:
+            key = cls._get_key(couple)
+            if keys[key] > 0:
+                keys[key] -= 1
+                found.append(couple)
+        return found
+
+    @staticmethod
+    def _get_key(couple: dict) -> tuple:
+        return tuple(
+            tuple(value) if isinstance(value, list) else value
+            for value in (couple[field] for field in sorted(couple.keys()))
+        )
+
+    @staticmethod
+    def _get_day(fingerprints: dict, date: str) -> list:
+        return [couple for couple in fingerprints['couples'] if couple['date'] == date]
+
+    @staticmethod
+    def _get_common_dates(old_fingerprints: dict, new_fingerprints: dict):
+        date = max(
+            datetime.datetime.strptime(old_fingerprints['from'], "%d.%m.%Y"),
+            datetime.datetime.strptime(new_fingerprints['from'], "%d.%m.%Y")
+        )
+        final_date = min(
+            datetime.datetime.strptime(old_fingerprints['to'], "%d.%m.%Y"),
+            datetime.datetime.strptime(new_fingerprints['to'], "%d.%m.%Y")
+        )
+        while date <= final_date:
+            yield date.strftime("%d.%m.%Y")
+            date += datetime.timedelta(days=1)
@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta
+from time import monotonic
+
+from APIs.Chsu.schedule import Schedule
+
+
+class ScheduleStore:
+    def __init__(self, max_age: float = 40 * 60):
+        self._max_age = max_age
+        self._days_by_name = {}
+        self._updated_at = {}
+        self._hits = 0
+        self._misses = 0
+
+    def get_status(self) -> dict:
+        return {
+            "entities": len(self._days_by_name),
+            "hits": self._hits,
+            "misses": self._misses
+        }
+
+    def update(self, name: str, schedule: Schedule, start_date: str, last_date: str = None) -> None:
+        days = schedule.get_days_by_date()
+        self._days_by_name[name] = {date: days.get(date) for date in self._get_dates(start_date, last_date)}
+        self._updated_at[name] = monotonic()
+
+    def get(self, name: str, start_date: str, last_date: str = None):
+        days = self._get_days(name, start_date, last_date)
+        if days is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        return Schedule.from_days(days)
+
+    def _get_days(self, name: str, start_date: str, last_date: str = None):
+        if name not in self._days_by_name or monotonic() - self._updated_at[name] > self._max_age:
+            return None
+        stored_days = self._days_by_name[name]
+        days = {}
+        for date in self._get_dates(start_date, last_date):
+            if date not in stored_days:
+                return None
+            if stored_days[date] is not None:
+                days[date] = stored_days[date]
+        return days
+
+    @staticmethod
+    def _get_dates(start_date: str, last_date: str = None):
+        date = datetime.strptime(start_date, "%d.%m.%Y")
+        final_date = datetime.strptime(last_date or start_date, "%d.%m.%Y")
+        while date <= final_date:
+            yield date.strftime("%d.%m.%Y")
+            date += timedelta(days=1)
@@ -0,0 +1,125 @@
+import asyncio
+from asyncio import AbstractEventLoop
+from itertools import count
+from time import monotonic
+
+from APIs.Dispatcher.token_bucket import TokenBucket
+from Exceptions.rate_limited import RateLimited
+
+
+class OutboundDispatcher:
+    INTERACTIVE = 0
+    BULK = 1
+
+    def __init__(
+            self,
+            event_loop: AbstractEventLoop,
+            global_rate: float = None,
+            per_chat_rate: float = None,
+            per_chat_capacity: float = None,
+            workers: int = 8,
+            max_retries: int = 3
+    ):
+        self._event_loop = event_loop
+        self._global_bucket = TokenBucket(global_rate) if global_rate else None
+        self._per_chat_rate = per_chat_rate
+        self._per_chat_capacity = per_chat_capacity
+        self._chat_buckets = {}
+        self._max_retries = max_retries
+        self._queue = asyncio.PriorityQueue()
+        self._sequence = count()
+        self._lanes = {
+            lane: {"queued": 0, "deferred": 0, "sent": 0, "retried": 0, "failed": 0, "latency sum": 0.0, "max latency": 0.0}
+            for lane in (self.INTERACTIVE, self.BULK)
+        }
+        self._workers = [event_loop.create_task(self._work()) for _ in range(workers)]
+
+    def get_status(self) -> dict:
+        return {
+            name: {
+                "queue depth": lane["queued"],
+                "deferred": lane["deferred"],
+                "sent": lane["sent"],
+                "retried": lane["retried"],
+                "failed": lane["failed"],
+                "average latency": round(lane["latency sum"] / lane["sent"], 3) if lane["sent"] else 0,
+                "max latency": round(lane["max latency"], 3)
+            } for name, lane in (("interactive", self._lanes[self.INTERACTIVE]), ("bulk", self._lanes[self.BULK]))
+        }
+
+    async def submit(self, request_factory, chat_id=None, priority: int = INTERACTIVE):
+        future = self._event_loop.create_future()
+        self._put((priority, next(self._sequence), monotonic(), chat_id, request_factory, future, 0))
+        return await future
+
+    def _put(self, item: tuple) -> None:
+        self._lanes[item[0]]["queued"] += 1
+        self._queue.put_nowait(item)
+
+    def _defer(self, item: tuple, delay: float) -> None:
+        self._lanes[item[0]]["deferred"] += 1
+        self._event_loop.call_later(delay, self._undefer, item)
+
+    def _undefer(self, item: tuple) -> None:
+        self._lanes[item[0]]["deferred"] -= 1
+        self._put(item)
+
+    async def _work(self) -> None:
+        while True:
+            item = await self._queue.get()
+            priority, _, enqueued_at, chat_id, request_factory, future, attempt = item
+            self._lanes[priority]["queued"] -= 1
+            if future.done():
+                continue
+            global_wait = self._global_bucket.get_wait() if self._global_bucket is not None else 0
+            if global_wait > 0:
+                self._put(item)
+                await asyncio.sleep(global_wait)
+                continue
+            if self._per_chat_rate and chat_id is not None:
+                chat_wait = self._get_chat_bucket(chat_id).try_acquire()
+                if chat_wait > 0:
+                    self._defer(item, chat_wait)
+                    continue
+            if self._global_bucket is not None:
+                self._global_bucket.try_acquire()
+            await self._process(item)
+
+    async def _process(self, item: tuple) -> None:
+        priority, sequence, enqueued_at, chat_id, request_factory, future, attempt = item
+        lane = self._lanes[priority]
+        try:
+            result = await request_factory()
+        except RateLimited as err:
+            if attempt == self._max_retries:
+                self._fail(lane, future, err)
+                return
+            lane["retried"] += 1
+            self._defer(
+                (priority, sequence, enqueued_at, chat_id, request_factory, future, attempt + 1),
+                err.retry_after or 2 ** attempt
+            )
+        except Exception as err:
+            self._fail(lane, future, err)
+        else:
+            latency = monotonic() - enqueued_at
+            lane["sent"] += 1
+            lane["latency sum"] += latency
+            lane["max latency"] = max(lane["max latency"], latency)
+            if not future.done():
+                future.set_result(result)
+
+    @staticmethod
+    def _fail(lane, future, err) -> None:
+        lane["failed"] += 1
+        if not future.done():
+            future.set_exception(err)
+
+    def _get_chat_bucket(self, chat_id) -> TokenBucket:
+        if chat_id not in self._chat_buckets:
+            if len(self._chat_buckets) > 10000:
+                self._chat_buckets = {
+                    chat: bucket for chat, bucket in self._chat_buckets.items() if not bucket.is_full()
+                }
+            self._chat_buckets[chat_id] = TokenBucket(self._per_chat_rate, self._per_chat_capacity)
+        return self._chat_buckets[chat_id]
@@ -0,0 +1,36 @@
+import asyncio
+from time import monotonic
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float = None):
+        self._rate = rate
+        self._capacity = capacity or rate
+        self._tokens = self._capacity
+        self._updated_at = monotonic()
+
+    def is_full(self) -> bool:
+        self._refill()
+        return self._tokens >= self._capacity
+
+    def get_wait(self) -> float:
+        self._refill()
+        return max(1 - self._tokens, 0) / self._rate
+
+    def try_acquire(self) -> float:
+        wait = self.get_wait()
+        if wait == 0:
+            self._tokens -= 1
+        return wait
+
+    async def acquire(self) -> None:
+        self._refill()
+        while self._tokens < 1:
+            await asyncio.sleep((1 - self._tokens) / self._rate)
+            self._refill()
+        self._tokens -= 1
+
+    def _refill(self) -> None:
+        now = monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated_at) * self._rate)
+        self._updated_at = now
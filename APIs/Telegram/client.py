@@ -1,6 +1,13 @@
+import asyncio
 from asyncio import AbstractEventLoop
+from json import dumps
+from time import monotonic
 
+from APIs.Dispatcher.dispatcher import OutboundDispatcher
+from APIs.Telegram.webhook_reply import WebhookReply
 from APIs.abstract_messanger import Messanger
+from Exceptions.rate_limited import RateLimited
+from Exceptions.telegram_error import TelegramError
 from Keyboards.abstract_keyboard import Keyboard
 from Keyboards.telegram import TelegramKeyboard
 from Wrappers.AIOHttp.aiohttp import AIOHttpWrapper
@@ -8,59 +15,148 @@ from Wrappers.AIOHttp.aiohttp import AIOHttpWrapper
 
 # при переименовании необходимо переопределить get_name()!!!
 class Telegram(Messanger):
-    def __init__(self, token: str, event_loop: AbstractEventLoop):
+    _keyboard = TelegramKeyboard()
+
+    def __init__(self, token: str, event_loop: AbstractEventLoop, inline_replies: bool = False):
         super().__init__()
         self._client = AIOHttpWrapper(event_loop)
         self._bot_link = f"https://api.telegram.org/bot{token}"
+        self._dispatcher = OutboundDispatcher(event_loop, global_rate=30, per_chat_rate=1, per_chat_capacity=3)
+        self._json_headers = {"Content-Type": "application/json"}
+        self._method_metrics = {}
+        self._inline_replies = inline_replies
 
     async def get_status(self):
-        return (await self._call_get_method("getMe"))['ok']
+        try:
+            await self._call_method("getMe")
+            return True
+        except Exception as err:
+            return f"{err.__class__.__name__}: {err}"
 
     @staticmethod
     def get_admins():
         return [672743407]
 
-    @staticmethod
-    def get_keyboard_inst() -> Keyboard:
-        return TelegramKeyboard()
+    @classmethod
+    def get_keyboard_inst(cls) -> Keyboard:
+        return cls._keyboard
 
     async def confirm_event(self, callback_query_id: str, peer_id: int = None) -> None:
-        await self._call_get_method("answerCallbackQuery", {"callback_query_id": callback_query_id})
-
-    async def send_message(self, message: str, peer_ids: list, keyboard: str = None):
-        for peer_id in peer_ids:
-            params = {"chat_id": peer_id, "text": message}
-            if keyboard is not None:
-                params["reply_markup"] = keyboard
-            await self._call_get_method("sendMessage", params)
-
-    async def send_coords(self, peer_ids: list, lat: int, lon: int, keyboard: str = None):
-        for peer_id in peer_ids:
-            params = {"chat_id": peer_id, "latitude": lat, "longitude": lon}
-            if keyboard is not None:
-                params["reply_markup"] = keyboard
-            await self._call_get_method("sendLocation", params)
+        try:
+            await self._call_method("answerCallbackQuery", {"callback_query_id": callback_query_id})
+        except Exception as err:
+            print(f"{err.__class__.__name__}: {err}")
+
+    async def send_message(
+            self, message: str, peer_ids: list, keyboard: str = None, priority: int = OutboundDispatcher.INTERACTIVE
+    ) -> dict:
+        return await self._send_to_peers("sendMessage", peer_ids, {"text": message}, keyboard, priority)
+
+    async def send_coords(
+            self, peer_ids: list, lat: int, lon: int, keyboard: str = None,
+            priority: int = OutboundDispatcher.INTERACTIVE
+    ) -> dict:
+        return await self._send_to_peers(
+            "sendLocation", peer_ids, {"latitude": lat, "longitude": lon}, keyboard, priority
+        )
+
+    async def _send_to_peers(self, method_name: str, peer_ids: list, params: dict, keyboard: str, priority: int):
+        shared_body = self._get_shared_body(params, keyboard)
+        return dict(zip(peer_ids, await asyncio.gather(*[
+            self._send_to_peer(method_name, peer_id, shared_body, priority) for peer_id in peer_ids
+        ])))
+
+    async def _send_to_peer(self, method_name: str, peer_id, shared_body: bytes, priority: int):
+        body = b'{"chat_id": ' + dumps(peer_id).encode() + (b', ' + shared_body if shared_body else b'') + b'}'
+        webhook_reply = WebhookReply.get_current() if self._inline_replies else None
+        if webhook_reply is not None:
+            if webhook_reply.capture(method_name, peer_id, body):
+                return True
+            for spilled_method_name, spilled_body in webhook_reply.take_spilled():
+                await self._send_outbound(spilled_method_name, peer_id, spilled_body, priority)
+        return await self._send_outbound(method_name, peer_id, body, priority)
+
+    async def _send_outbound(self, method_name: str, peer_id, body: bytes, priority: int):
+        try:
+            await self._dispatcher.submit(lambda: self._call_limited_method(method_name, body), peer_id, priority)
+            return True
+        except TelegramError as err:
+            return f"Error {err.error_code}: {err}"
+        except Exception as err:
+            return f"{err.__class__.__name__}: {err}"
+
+    @staticmethod
+    def _get_shared_body(params: dict, keyboard: str = None) -> bytes:
+        fields = [dumps(params, ensure_ascii=False)[1:-1]] if params else []
+        if keyboard is not None:
+            fields.append(f'"reply_markup": {keyboard}')
+        return ", ".join(fields).encode()
+
+    def is_inline_replies(self) -> bool:
+        return self._inline_replies
+
+    def get_http_status(self) -> dict:
+        return {
+            "hosts": self._client.get_status(),
+            "methods": {
+                method_name: {
+                    **metrics,
+                    "latency sum": round(metrics["latency sum"], 3),
+                    "average latency": round(metrics["latency sum"] / metrics["calls"], 3) if metrics["calls"] else 0
+                } for method_name, metrics in self._method_metrics.items()
+            }
+        }
 
     async def get_webhook(self):
-        data = await self._call_get_method("getWebhookInfo")
-        if "result" in data:
-            return data["result"]["url"]
+        try:
+            return (await self._call_method("getWebhookInfo"))["url"]
+        except Exception as err:
+            print(f"{err.__class__.__name__}: {err}")
+            return ""
 
     async def set_webhook(self, url: str = None):
-        if url:
-            response = await self._call_get_method("setWebhook", {"url": url})
-        else:
-            response = await self._call_get_method("deleteWebhook")
-        if response["ok"]:
+        try:
+            if url:
+                await self._call_method("setWebhook", {"url": url})
+            else:
+                await self._call_method("deleteWebhook")
             return {"status": 200, "text": url}
-        else:
-            return {"status": response['error_code'], "text": f"{response['description']}\nUrl: {url}"}
+        except TelegramError as err:
+            return {"status": err.error_code, "text": f"{err}\nUrl: {url}"}
 
-    async def _call_get_method(self, method_name: str, params: dict = None):
+    async def _call_limited_method(self, method_name: str, body: bytes):
         try:
-            return await self._client.get(f"{self._bot_link}/{method_name}", params=params)
-        except Exception as e:
-            print(e)
+            return await self._call_method(method_name, body=body)
+        except TelegramError as err:
+            if err.error_code == 429:
+                raise RateLimited(str(err), err.retry_after) from err
+            raise
 
-    async def _call_post_method(self, method_name: str, json: dict = None):
-        return await self._client.post(f"{self._bot_link}/{method_name}", json=json)
+    async def _call_method(self, method_name: str, params: dict = None, body: bytes = None):
+        metrics = self._method_metrics.setdefault(
+            method_name, {"calls": 0, "errors": 0, "latency sum": 0.0, "max latency": 0.0}
+        )
+        metrics["calls"] += 1
+        started_at = monotonic()
+        try:
+            if body is None:
+                response = await self._client.post(f"{self._bot_link}/{method_name}", json=params or {})
+            else:
+                response = await self._client.post(
+                    f"{self._bot_link}/{method_name}", headers=self._json_headers, data=body
+                )
+        except Exception:
+            metrics["errors"] += 1
+            raise
+        finally:
+            latency = monotonic() - started_at
+            metrics["latency sum"] += latency
+            metrics["max latency"] = max(metrics["max latency"], round(latency, 3))
+        if not response.get('ok'):
+            metrics["errors"] += 1
+            raise TelegramError(
+                response.get('description'),
+                response.get('error_code'),
+                response.get('parameters', {}).get('retry_after')
+            )
+        return response.get('result')
@@ -0,0 +1,60 @@
+import asyncio
+from contextvars import ContextVar
+
+
+class WebhookReply:
+    _current = ContextVar("telegram_webhook_reply", default=None)
+    _stats = {"inline": 0, "outbound": 0, "spilled": 0, "timed out": 0}
+
+    def __init__(self, peer_id, timeout: float = 1.0):
+        self._peer_id = peer_id
+        self._timeout = timeout
+        self._captured = None
+        self._spilled = []
+        self._released = False
+        self._multi = False
+
+    @classmethod
+    def get_current(cls):
+        return cls._current.get()
+
+    @classmethod
+    def get_status(cls) -> dict:
+        return dict(cls._stats)
+
+    def start(self, submit) -> asyncio.Future:
+        token = self._current.set(self)
+        try:
+            return submit()
+        finally:
+            self._current.reset(token)
+
+    async def get_response(self, task: asyncio.Future):
+        try:
+            await asyncio.wait_for(asyncio.shield(task), self._timeout)
+        except asyncio.TimeoutError:
+            self._stats["timed out"] += 1
+        except Exception:
+            pass
+        captured, self._captured, self._released = self._captured, None, True
+        self._stats["inline" if captured is not None else "outbound"] += 1
+        if captured is None:
+            return None
+        method_name, body = captured
+        return b'{"method": "' + method_name.encode() + b'", ' + body[1:]
+
+    def capture(self, method_name: str, peer_id, body: bytes) -> bool:
+        if self._released or self._multi or peer_id != self._peer_id:
+            return False
+        if self._captured is None:
+            self._captured = (method_name, body)
+            return True
+        self._stats["spilled"] += 1
+        self._multi = True
+        self._spilled.append(self._captured)
+        self._captured = None
+        return False
+
+    def take_spilled(self) -> list:
+        spilled, self._spilled = self._spilled, []
+        return spilled
@@ -1,3 +1,4 @@
+import asyncio
 from asyncio import AbstractEventLoop
 from random import randint
 
@@ -5,18 +6,28 @@ from aiovk import TokenSession, API
 from aiovk.drivers import HttpDriver
 from aiovk.exceptions import VkAPIError
 
+from APIs.Dispatcher.dispatcher import OutboundDispatcher
+from APIs.Dispatcher.token_bucket import TokenBucket
+from APIs.Vk.execute_queue import ExecuteQueue
 from APIs.abstract_messanger import Messanger
+from Exceptions.rate_limited import RateLimited
+from Exceptions.vk_execute_error import VkExecuteError
 from Keyboards.abstract_keyboard import Keyboard
 from Keyboards.vk import VkKeyboard
 
 
 # при переименовании необходимо переопределить get_name()!!!
 class Vk(Messanger):
+    _keyboard = VkKeyboard()
+
     def __init__(self, token: str, event_loop: AbstractEventLoop) -> None:
         super().__init__()
         session = TokenSession(access_token=token, driver=HttpDriver(loop=event_loop))
         session.API_VERSION = "5.131"
         self._api = API(session)
+        self._execute_queue = ExecuteQueue(self._api, event_loop, TokenBucket(20))
+        self._dispatcher = OutboundDispatcher(event_loop, workers=2 * self._execute_queue.get_max_calls())
+        self._peers_per_request = 100
 
     async def get_status(self) -> str:
         try:
@@ -27,27 +38,72 @@ class Vk(Messanger):
                 return "working"
             return f"Error {err.error_code}: {err.error_msg}"
 
+    def get_queue_status(self) -> dict:
+        return self._execute_queue.get_status()
+
     @staticmethod
     def get_admins() -> list:
         return [447828812, 113688146]
 
-    @staticmethod
-    def get_keyboard_inst() -> Keyboard:
-        return VkKeyboard()
+    @classmethod
+    def get_keyboard_inst(cls) -> Keyboard:
+        return cls._keyboard
 
     async def confirm_event(self, callback_query_id: str, peer_id: int = None) -> None:
         await self._api.messages.sendMessageEventAnswer(event_id=callback_query_id, peer_id=peer_id, user_id=peer_id)
 
-    async def send_message(self, message: str, peer_ids: list, keyboard: str) -> None:
-        for peer_id in peer_ids:
-            args = dict(message=message, peer_ids=peer_id, random_id=randint(0, 4096))
-            if keyboard:
-                args['keyboard'] = keyboard
-            await self._api.messages.send(**args)
-
-    async def send_coords(self, peer_ids: list, lat: int, lon: int, keyboard: str = None):
-        for peer_id in peer_ids:
-            args = dict(peer_ids=peer_id, random_id=randint(0, 4096), lat=lat, long=lon)
-            if keyboard:
-                args['keyboard'] = keyboard
-            await self._api.messages.send(**args)
+    async def send_message(
+            self, message: str, peer_ids: list, keyboard: str, priority: int = OutboundDispatcher.INTERACTIVE
+    ) -> dict:
+        args = dict(message=message)
+        if keyboard:
+            args['keyboard'] = keyboard
+        return await self._send_batched(peer_ids, args, priority)
+
+    async def send_coords(
+            self, peer_ids: list, lat: int, lon: int, keyboard: str = None,
+            priority: int = OutboundDispatcher.INTERACTIVE
+    ) -> dict:
+        args = dict(lat=lat, long=lon)
+        if keyboard:
+            args['keyboard'] = keyboard
+        return await self._send_batched(peer_ids, args, priority)
+
+    async def _send_batched(self, peer_ids: list, args: dict, priority: int) -> dict:
+        statuses = {}
+        for chunk_statuses in await asyncio.gather(*[
+            self._send_chunk(peer_ids[index:index + self._peers_per_request], args, priority)
+            for index in range(0, len(peer_ids), self._peers_per_request)
+        ]):
+            statuses.update(chunk_statuses)
+        return statuses
+
+    async def _send_chunk(self, chunk: list, args: dict, priority: int) -> dict:
+        args = dict(peer_ids=",".join(map(str, chunk)), random_id=randint(0, 4096), **args)
+        try:
+            response = await self._dispatcher.submit(lambda: self._send_limited(args), priority=priority)
+            return self._parse_delivery_statuses(response)
+        except VkAPIError as err:
+            print(f"Error {err.error_code}: {err.error_msg}")
+            return {peer_id: f"Error {err.error_code}: {err.error_msg}" for peer_id in chunk}
+        except (VkExecuteError, RateLimited) as err:
+            print(f"{err.__class__.__name__}: {err}")
+            return {peer_id: f"{err.__class__.__name__}: {err}" for peer_id in chunk}
+
+    async def _send_limited(self, args: dict):
+        try:
+            return await self._execute_queue.call("messages.send", **args)
+        except VkAPIError as err:
+            if err.error_code in (6, 9):
+                raise RateLimited(err.error_msg, 1)
+            raise
+
+    @staticmethod
+    def _parse_delivery_statuses(response: list) -> dict:
+        statuses = {}
+        for result in response:
+            if 'error' in result:
+                statuses[result['peer_id']] = f"Error {result['error']['code']}: {result['error']['description']}"
+            else:
+                statuses[result['peer_id']] = True
+        return statuses
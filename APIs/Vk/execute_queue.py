@@ -0,0 +1,102 @@
+from asyncio import AbstractEventLoop
+from json import dumps
+
+from aiovk import API
+
+from APIs.Dispatcher.token_bucket import TokenBucket
+from Exceptions.vk_execute_error import VkExecuteError
+
+
+class ExecuteQueue:
+    def __init__(
+            self,
+            api: API,
+            event_loop: AbstractEventLoop,
+            request_bucket: TokenBucket = None,
+            max_calls: int = 25,
+            linger: float = 0.05,
+            max_code_length: int = 60000
+    ):
+        self._api = api
+        self._event_loop = event_loop
+        self._request_bucket = request_bucket
+        self._max_calls = max_calls
+        self._linger = linger
+        self._max_code_length = max_code_length
+        self._pending = []
+        self._flush_timer = None
+        self._executions = set()
+        self._executed_requests = 0
+        self._executed_calls = 0
+
+    def get_max_calls(self) -> int:
+        return self._max_calls
+
+    def get_status(self) -> dict:
+        return {
+            "pending": len(self._pending),
+            "requests": self._executed_requests,
+            "calls": self._executed_calls
+        }
+
+    async def call(self, method: str, **params):
+        future = self._event_loop.create_future()
+        self._pending.append((method, params, f"API.{method}({dumps(params, ensure_ascii=False)})", future))
+        if len(self._pending) >= self._max_calls:
+            self._flush()
+        elif self._flush_timer is None:
+            self._flush_timer = self._event_loop.call_later(self._linger, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        self._executions = set()
+        while self._pending:
+            batch = self._take_batch()
+            task = self._event_loop.create_task(self._execute(batch))
+            self._executions.add(task)
+            task.add_done_callback(self._executions.discard)
+
+    def _take_batch(self) -> list:
+        batch = [self._pending.pop(0)]
+        code_length = len(batch[0][2])
+        while self._pending and len(batch) < self._max_calls and \
+                code_length + len(self._pending[0][2]) < self._max_code_length:
+            code_length += len(self._pending[0][2]) + 1
+            batch.append(self._pending.pop(0))
+        return batch
+
+    async def _execute(self, batch: list) -> None:
+        self._executed_requests += 1
+        self._executed_calls += len(batch)
+        error = VkExecuteError("execute returned no result for this call")
+        try:
+            if self._request_bucket is not None:
+                await self._request_bucket.acquire()
+            if len(batch) == 1:
+                results = [await self._get_method(batch[0][0])(**batch[0][1])]
+            else:
+                results = await self._api.execute(code=f"return [{','.join(call[2] for call in batch)}];")
+            if not isinstance(results, list) or len(results) != len(batch):
+                raise VkExecuteError(f"execute returned {results!r:.100} for {len(batch)} calls")
+            for (method, _, _, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if result is False:
+                    future.set_exception(VkExecuteError(f"{method} failed inside execute"))
+                else:
+                    future.set_result(result)
+        except Exception as err:
+            error = err
+        finally:
+            for *_, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+
+    def _get_method(self, method: str):
+        request = self._api
+        for part in method.split('.'):
+            request = getattr(request, part)
+        return request
@@ -1,13 +1,17 @@
+from APIs.Dispatcher.dispatcher import OutboundDispatcher
 from Keyboards.abstract_keyboard import Keyboard
 
 
 class Messanger:
     def __init__(self):
-        pass
+        self._dispatcher = None
 
     async def get_status(self) -> str:
         pass
 
+    def get_dispatcher_status(self) -> dict:
+        return self._dispatcher.get_status() if self._dispatcher else {}
+
     @staticmethod
     def get_keyboard_inst() -> Keyboard:
         return Keyboard()
@@ -22,8 +26,13 @@ class Messanger:
     async def confirm_event(self, callback_query_id: str, peer_id: int = None) -> None:
         pass
 
-    async def send_message(self, message: str, peer_ids: list, keyboard: str) -> None:
+    async def send_message(
+            self, message: str, peer_ids: list, keyboard: str, priority: int = OutboundDispatcher.INTERACTIVE
+    ) -> dict:
         pass
 
-    async def send_coords(self, peer_ids: list, lat: int, lon: int, keyboard: str = None):
+    async def send_coords(
+            self, peer_ids: list, lat: int, lon: int, keyboard: str = None,
+            priority: int = OutboundDispatcher.INTERACTIVE
+    ) -> dict:
         pass
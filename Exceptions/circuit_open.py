@@ -0,0 +1,4 @@
+class CircuitOpen(ConnectionError):
+    def __init__(self, message="Circuit is open", retry_after: float = None):
+        super().__init__(message)
+        self.retry_after = retry_after
@@ -0,0 +1,4 @@
+class RateLimited(Exception):
+    def __init__(self, message="Rate limit exceeded", retry_after: float = None):
+        super().__init__(message)
+        self.retry_after = retry_after
@@ -0,0 +1,5 @@
+class TelegramError(Exception):
+    def __init__(self, message="Telegram Bot API error", error_code: int = None, retry_after: float = None):
+        super().__init__(message)
+        self.error_code = error_code
+        self.retry_after = retry_after
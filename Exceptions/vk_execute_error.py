@@ -0,0 +1,3 @@
+class VkExecuteError(Exception):
+    def __init__(self, message="VK API call inside execute failed"):
+        super().__init__(message)
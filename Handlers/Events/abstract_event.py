@@ -1,52 +1,73 @@
+from re import match
+
 from APIs.Chsu.client import Chsu
 from APIs.abstract_messanger import Messanger
-from Handlers.date_handler import DateHandler
-from Wrappers.MongoDb.database import MongoDB
+from Wrappers.abstract_storage import Storage
 
 
 class AbstractHandler:
+    _commands = ()
+    _pattern = None
+
     def __init__(
             self,
-            a: Messanger = None,
-            db: MongoDB = None,
+            messangers: list = None,
+            db: Storage = None,
             ch: Chsu = None
     ):
         self._next_handler = None
 
-        self._chat_platform = a
+        self._chat_platforms = {messanger.get_name(): messanger for messanger in messangers or ()}
         self._database = db
         self._chsu_api = ch
-        self._keyboard = self._chat_platform.get_keyboard_inst()
-
-        self._date_handler = DateHandler()
 
     def set_next(self, handler):
         self._next_handler = handler
         return handler
 
+    def _get_chat_platform(self, event: dict) -> Messanger:
+        return self._chat_platforms[event['platform']]
+
+    @classmethod
+    def get_commands(cls) -> tuple:
+        return cls._commands
+
+    @classmethod
+    def get_pattern(cls):
+        return cls._pattern
+
+    async def can_handle(self, event: dict) -> bool:
+        return await self._can_handle(event)
+
     async def handle_event(self, event: dict) -> None:
+        if await self._can_handle(event):
+            await self.process_event(event)
+        else:
+            await self._next_handler.handle_event(event)
+
+    async def process_event(self, event: dict) -> None:
+        chat_platform = self._get_chat_platform(event)
         try:
-            if await self._can_handle(event):
-                await self._handle(event)
-            else:
-                await self._next_handler.handle_event(event)
+            await self._handle(event)
         except TypeError:
             return
         except Exception as err:
-            await self._chat_platform.send_message(
+            await chat_platform.send_message(
                 f"Ошибка в {self.__class__.__name__}:\n{err.__class__.__qualname__}: {err}\n\nСобытие: {event}",
-                self._chat_platform.get_admins(),
-                self._chat_platform.get_keyboard_inst().get_standard_keyboard()
+                chat_platform.get_admins(),
+                chat_platform.get_keyboard_inst().get_standard_keyboard()
             )
-            await self._chat_platform.send_message(
+            await chat_platform.send_message(
                 f"Произошла ошибка: {err.__class__.__qualname__}.",
                 [event["from_id"]],
-                self._chat_platform.get_keyboard_inst().get_standard_keyboard()
+                chat_platform.get_keyboard_inst().get_standard_keyboard()
             )
 
-    @staticmethod
-    async def _can_handle(event) -> bool:
-        pass
+    async def _can_handle(self, event) -> bool:
+        return 'text' in event and (
+            event['text'] in self._commands or
+            self._pattern is not None and match(self._pattern, event['text']) is not None
+        )
 
     async def _handle(self, event) -> None:
         pass
@@ -1,31 +1,29 @@
 from APIs.Chsu.client import Chsu
-from APIs.abstract_messanger import Messanger
 from Handlers.Events.abstract_event import AbstractHandler
-from Wrappers.MongoDb.database import MongoDB
+from Wrappers.abstract_storage import Storage
 
 
 class AdminsMessageHandler(AbstractHandler):
+    _pattern = r'^!'
+
     def __init__(
             self,
-            m: Messanger = None,
-            db: MongoDB = None,
+            messangers: list = None,
+            db: Storage = None,
             ch: Chsu = None
     ):
-        super().__init__(m, db, ch)
-
-    @staticmethod
-    async def _can_handle(event) -> bool:
-        return len(event['text']) != 0 and event['text'][0] == "!"
+        super().__init__(messangers, db, ch)
 
     async def _handle(self, event) -> None:
+        chat_platform = self._get_chat_platform(event)
         to_id = int(event['text'].split(':')[0][1:])
         message = event['text'].split(':')[1]
-        kb = self._chat_platform.get_keyboard_inst().get_standard_keyboard()
-        await self._chat_platform.send_message(
+        kb = chat_platform.get_keyboard_inst().get_standard_keyboard()
+        await chat_platform.send_message(
             f"Сообщение отправлено",
             [event['from_id']], kb
         )
-        await self._chat_platform.send_message(
+        await chat_platform.send_message(
             f"Сообщение от администратора: {message}\n\n"
             f"Для ответа используйте \";\" в начале сообщения.", [to_id], kb
         )
@@ -1,24 +1,29 @@
 from APIs.Chsu.client import Chsu
-from APIs.abstract_messanger import Messanger
 from Handlers.Events.abstract_event import AbstractHandler
-from Wrappers.MongoDb.database import MongoDB
+from Wrappers.abstract_storage import Storage
 
 
 class AnotherEventHandler(AbstractHandler):
     def __init__(
             self,
-            m: Messanger = None,
-            db: MongoDB = None,
+            messangers: list = None,
+            db: Storage = None,
             ch: Chsu = None
     ):
-        super().__init__(m, db, ch)
+        super().__init__(messangers, db, ch)
 
     @staticmethod
     async def _can_handle(event) -> bool:
         return True
 
     async def _handle(self, event) -> None:
-        kb = self._chat_platform.get_keyboard_inst().get_standard_keyboard()
-        await self._chat_platform.send_message(
+        chat_platform = self._get_chat_platform(event)
+        suggestions = self._chsu_api.get_name_suggestions(event['text'])
+        if suggestions:
+            kb = chat_platform.get_keyboard_inst().get_suggestions_keyboard(suggestions)
+            await chat_platform.send_message("Возможно, вы имели в виду:", [event['from_id']], kb)
+            return
+        kb = chat_platform.get_keyboard_inst().get_standard_keyboard()
+        await chat_platform.send_message(
             "Такой команды нет. Проверьте правильность ввода.", [event['from_id']], kb
         )
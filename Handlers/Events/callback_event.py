@@ -1,23 +1,23 @@
 from APIs.Chsu.client import Chsu
-from APIs.abstract_messanger import Messanger
 from Handlers.Events.abstract_event import AbstractHandler
-from Wrappers.MongoDb.database import MongoDB
+from Wrappers.abstract_storage import Storage
 
 
 class CallbackHandler(AbstractHandler):
     def __init__(
             self,
-            m: Messanger = None,
-            db: MongoDB = None,
+            messangers: list = None,
+            db: Storage = None,
             ch: Chsu = None
     ):
-        super().__init__(m, db, ch)
+        super().__init__(messangers, db, ch)
 
     @staticmethod
     async def _can_handle(event) -> bool:
         return 'payload' in event
 
     async def _handle(self, event) -> None:
+        chat_platform = self._get_chat_platform(event)
         buildings = {
             'Советский, 8': (59.12047482336482, 37.93102001811573),
             'Победы, 12': (59.133350120818704, 37.90253587101461),
@@ -29,5 +29,5 @@ class CallbackHandler(AbstractHandler):
             'Труда, 3': (59.11757126831587, 37.92001688361389),
             'Чкалова, 31А': (59.12975151805174, 37.87396552737589)
         }
-        await self._chat_platform.confirm_event(event['event_id'], event['from_id'])
-        await self._chat_platform.send_coords([event['from_id']], *list(buildings.values())[int(event['payload'])])
+        await chat_platform.confirm_event(event['event_id'], event['from_id'])
+        await chat_platform.send_coords([event['from_id']], *list(buildings.values())[int(event['payload'])])
@@ -1,22 +1,20 @@
 from APIs.Chsu.client import Chsu
-from APIs.abstract_messanger import Messanger
 from Handlers.Events.abstract_event import AbstractHandler
-from Wrappers.MongoDb.database import MongoDB
+from Wrappers.abstract_storage import Storage
 
 
 class ChangeGroupHandler(AbstractHandler):
+    _commands = ("Изменить группу",)
+
     def __init__(
             self,
-            m: Messanger = None,
-            db: MongoDB = None,
+            messangers: list = None,
+            db: Storage = None,
             ch: Chsu = None
     ):
-        super().__init__(m, db, ch)
-
-    @staticmethod
-    async def _can_handle(event) -> bool:
-        return event['text'] == "Изменить группу"
+        super().__init__(messangers, db, ch)
 
     async def _handle(self, event) -> None:
-        kb = self._chat_platform.get_keyboard_inst().get_change_group_keyboard()
-        await self._chat_platform.send_message("Кто вы?", [event['from_id']], kb)
+        chat_platform = self._get_chat_platform(event)
+        kb = chat_platform.get_keyboard_inst().get_change_group_keyboard()
+        await chat_platform.send_message("Кто вы?", [event['from_id']], kb)
@@ -1,22 +1,20 @@
 from APIs.Chsu.client import Chsu
-from APIs.abstract_messanger import Messanger
 from Handlers.Events.abstract_event import AbstractHandler
-from Wrappers.MongoDb.database import MongoDB
+from Wrappers.abstract_storage import Storage
 
 
 class ScheduleChangesHandler(AbstractHandler):
+    _commands = ("Изменения в расписании",)
+
     def __init__(
             self,
-            m: Messanger = None,
-            db: MongoDB = None,
+            messangers: list = None,
+            db: Storage = None,
             ch: Chsu = None
     ):
-        super().__init__(m, db, ch)
-
-    @staticmethod
-    async def _can_handle(event) -> bool:
-        return event['text'] == "Изменения в расписании"
+        super().__init__(messangers, db, ch)
 
     async def _handle(self, event) -> None:
-        kb = self._chat_platform.get_keyboard_inst().get_set_check_changes_keyboard()
-        await self._chat_platform.send_message("Изменения.", [event['from_id']], kb)
+        chat_platform = self._get_chat_platform(event)
+        kb = chat_platform.get_keyboard_inst().get_set_check_changes_keyboard()
+        await chat_platform.send_message("Изменения.", [event['from_id']], kb)
@@ -1,33 +1,29 @@
-from re import match
-
 from APIs.Chsu.client import Chsu
 from APIs.Chsu.schedule import Schedule
-from APIs.abstract_messanger import Messanger
 from Handlers.Events.abstract_event import AbstractHandler
-from Wrappers.MongoDb.database import MongoDB
+from Handlers.date_handler import DateHandler
+from Wrappers.abstract_storage import Storage
 from Exceptions.empty_response import EmptyResponse as MongoDBEmptyRespException
 
 
 class DoubleDateHandler(AbstractHandler):
+    _pattern = r'^(0[1-9]|1\d|2\d|3[0-1])[.](0[1-9]|1[0-2])-(0[1-9]|1\d|2\d|3[0-1]).(0[1-9]|1[0-2])$'
+
     def __init__(
             self,
-            m: Messanger = None,
-            db: MongoDB = None,
+            messangers: list = None,
+            db: Storage = None,
             ch: Chsu = None
     ):
-        super().__init__(m, db, ch)
-
-    @staticmethod
-    async def _can_handle(event) -> bool:
-        return match(
-            r'^(0[1-9]|1\d|2\d|3[0-1])[.](0[1-9]|1[0-2])-(0[1-9]|1\d|2\d|3[0-1]).(0[1-9]|1[0-2])$', event['text']
-        ) is not None
+        super().__init__(messangers, db, ch)
 
     async def _handle(self, event) -> None:
+        chat_platform = self._get_chat_platform(event)
+        date_handler = DateHandler()
         try:
-            self._date_handler.parse_date(event['text'])
-            schedule = await self._get_schedule(event['from_id'], *self._date_handler.get_string())
-            await self._send_messages([event['from_id']], schedule)
+            date_handler.parse_date(event['text'])
+            schedule = await self._get_schedule(chat_platform, event['from_id'], *date_handler.get_string())
+            await self._send_messages(chat_platform, [event['from_id']], schedule)
             return
         except ValueError:
             text = "Введена некорректная дата."
@@ -37,23 +33,27 @@ class DoubleDateHandler(AbstractHandler):
         except ConnectionError as err:
             text = f"Произошла ошибка при запросе расписания: {err}. " \
                    f"Попробуйте запросить его снова или свяжитесь с администратором."
-        await self._chat_platform.send_message(text, [event['from_id']], self._keyboard.get_standard_keyboard())
+        await chat_platform.send_message(
+            text, [event['from_id']], chat_platform.get_keyboard_inst().get_standard_keyboard()
+        )
 
-    async def _get_schedule(self, from_id, start_date, last_date=None):
+    async def _get_schedule(self, chat_platform, from_id, start_date, last_date=None):
         db_response = await self._database.get_user_data(
-            from_id, self._chat_platform.get_name(),
-            self._date_handler.get_current_date_object()
+            from_id, chat_platform.get_name(),
+            DateHandler().get_current_date_object()
         )
         name = db_response["group_name" if "group_name" in db_response else "professor_name"]
         return await self._chsu_api.get_schedule_list_string(name, start_date, last_date)
 
-    async def _send_messages(self, from_id, resp):
+    async def _send_messages(self, chat_platform, from_id, resp):
         for day in resp:
-            await self._send_message(from_id, day)
+            await self._send_message(chat_platform, from_id, day)
 
-    async def _send_message(self, from_id, day):
-        kb = self._keyboard.get_standard_keyboard()
+    @staticmethod
+    async def _send_message(chat_platform, from_id, day):
+        keyboard = chat_platform.get_keyboard_inst()
+        kb = keyboard.get_standard_keyboard()
         if len(day['callback_data']) > 0:
             address_codes = list(map(lambda a: Schedule.get_address_code(a), day['callback_data']))
-            kb = self._keyboard.get_geo_request_keyboard(day['callback_data'], address_codes)
-        await self._chat_platform.send_message(day['text'], [from_id], kb)
+            kb = keyboard.get_geo_request_keyboard(day['callback_data'], address_codes)
+        await chat_platform.send_message(day['text'], [from_id], kb)
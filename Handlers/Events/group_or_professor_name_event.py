@@ -1,18 +1,17 @@
 from APIs.Chsu.client import Chsu
-from APIs.abstract_messanger import Messanger
 from Handlers.Events.abstract_event import AbstractHandler
-from Wrappers.MongoDb.database import MongoDB
+from Wrappers.abstract_storage import Storage
 from Exceptions.empty_response import EmptyResponse
 
 
 class GroupOrProfessorNameHandler(AbstractHandler):
     def __init__(
             self,
-            m: Messanger = None,
-            db: MongoDB = None,
+            messangers: list = None,
+            db: Storage = None,
             ch: Chsu = None
     ):
-        super().__init__(m, db, ch)
+        super().__init__(messangers, db, ch)
 
     async def _can_handle(self, event) -> bool:
         try:
@@ -21,17 +20,18 @@ class GroupOrProfessorNameHandler(AbstractHandler):
             return False
 
     async def _handle(self, event) -> None:
+        chat_platform = self._get_chat_platform(event)
         await self._database.set_user_data(
             event['from_id'],
-            self._chat_platform.get_name(),
+            chat_platform.get_name(),
             **(
-                dict(professor_name=event['text'])
+                dict(professor_name=await self._chsu_api.get_canonical_name(event['text']))
                 if await self._chsu_api.get_user_type(event['text']) == "professor"
-                else dict(group_name=event['text'])
+                else dict(group_name=await self._chsu_api.get_canonical_name(event['text']))
             )
         )
-        await self._chat_platform.send_message(
+        await chat_platform.send_message(
             "Данные сохранены.\n",
             [event['from_id']],
-            self._keyboard.get_standard_keyboard()
+            chat_platform.get_keyboard_inst().get_standard_keyboard()
         )
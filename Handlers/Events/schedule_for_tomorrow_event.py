@@ -1,23 +1,22 @@
 from APIs.Chsu.client import Chsu
-from APIs.abstract_messanger import Messanger
 from Handlers.Events.abstract_event import AbstractHandler
-from Wrappers.MongoDb.database import MongoDB
+from Handlers.date_handler import DateHandler
+from Wrappers.abstract_storage import Storage
 
 
 class ScheduleForTomorrowHandler(AbstractHandler):
+    _commands = ("Расписание на завтра",)
+
     def __init__(
             self,
-            m: Messanger = None,
-            db: MongoDB = None,
+            messangers: list = None,
+            db: Storage = None,
             ch: Chsu = None
     ):
-        super().__init__(m, db, ch)
-
-    @staticmethod
-    async def _can_handle(event) -> bool:
-        return event['text'] == "Расписание на завтра"
+        super().__init__(messangers, db, ch)
 
     async def _handle(self, event) -> None:
-        self._date_handler.parse_tomorrow_word()
-        event['text'] = self._date_handler.get_string()[0][:-5]
+        date_handler = DateHandler()
+        date_handler.parse_tomorrow_word()
+        event['text'] = date_handler.get_string()[0][:-5]
         await self._next_handler.handle_event(event)
@@ -1,26 +1,24 @@
 from APIs.Chsu.client import Chsu
-from APIs.abstract_messanger import Messanger
 from Handlers.Events.abstract_event import AbstractHandler
-from Wrappers.MongoDb.database import MongoDB
+from Wrappers.abstract_storage import Storage
 
 
 class SetCheckChangesHandler(AbstractHandler):
+    _commands = ("Отслеживать изменения",)
+
     def __init__(
             self,
-            m: Messanger = None,
-            db: MongoDB = None,
+            messangers: list = None,
+            db: Storage = None,
             ch: Chsu = None
     ):
-        super().__init__(m, db, ch)
-
-    @staticmethod
-    async def _can_handle(event) -> bool:
-        return event['text'] == "Отслеживать изменения"
+        super().__init__(messangers, db, ch)
 
     async def _handle(self, event) -> None:
-        await self._database.set_check_changes_member(event['from_id'], self._chat_platform.get_name(), True)
-        kb = self._chat_platform.get_keyboard_inst().get_standard_keyboard()
-        await self._chat_platform.send_message(
+        chat_platform = self._get_chat_platform(event)
+        await self._database.set_check_changes_member(event['from_id'], chat_platform.get_name(), True)
+        kb = chat_platform.get_keyboard_inst().get_standard_keyboard()
+        await chat_platform.send_message(
             f"Теперь ежечасно вам будут приходить уведомления о изменениях "
             f"в расписании, если они будут.", [event['from_id']], kb
         )
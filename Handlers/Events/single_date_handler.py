@@ -1,22 +1,15 @@
-from re import match
-
 from APIs.Chsu.client import Chsu
-from APIs.abstract_messanger import Messanger
 from Handlers.Events.double_date_event import DoubleDateHandler
-from Wrappers.MongoDb.database import MongoDB
+from Wrappers.abstract_storage import Storage
 
 
 class SingleDateHandler(DoubleDateHandler):
+    _pattern = r'^(0[1-9]|1\d|2\d|3[0-1])[.](0[1-9]|1[0-2])$'
+
     def __init__(
             self,
-            m: Messanger = None,
-            db: MongoDB = None,
+            messangers: list = None,
+            db: Storage = None,
             ch: Chsu = None
     ):
-        super().__init__(m, db, ch)
-
-    @staticmethod
-    async def _can_handle(event) -> bool:
-        return match(
-            r'^(0[1-9]|1\d|2\d|3[0-1])[.](0[1-9]|1[0-2])$', event['text']
-        ) is not None
+        super().__init__(messangers, db, ch)
@@ -1,27 +1,25 @@
 from APIs.Chsu.client import Chsu
-from APIs.abstract_messanger import Messanger
 from Handlers.Events.abstract_event import AbstractHandler
-from Wrappers.MongoDb.database import MongoDB
+from Wrappers.abstract_storage import Storage
 
 
 class UserMessageHandler(AbstractHandler):
+    _pattern = r'^;'
+
     def __init__(
             self,
-            m: Messanger = None,
-            db: MongoDB = None,
+            messangers: list = None,
+            db: Storage = None,
             ch: Chsu = None
     ):
-        super().__init__(m, db, ch)
-
-    @staticmethod
-    async def _can_handle(event) -> bool:
-        return event['text'] and event['text'][0] == ';'
+        super().__init__(messangers, db, ch)
 
     async def _handle(self, event) -> None:
-        kb = self._chat_platform.get_keyboard_inst().get_standard_keyboard()
-        await self._chat_platform.send_message(
+        chat_platform = self._get_chat_platform(event)
+        kb = chat_platform.get_keyboard_inst().get_standard_keyboard()
+        await chat_platform.send_message(
             f"Сообщение от пользователя: {event['text'][1:]}\n\n"
             f"Для ответа используйте \"!{event['from_id']}: %сообщение%\".",
-            self._chat_platform.get_admins(), kb
+            chat_platform.get_admins(), kb
         )
-        await self._chat_platform.send_message(f"Сообщение отправлено.", [event['from_id']], kb)
+        await chat_platform.send_message(f"Сообщение отправлено.", [event['from_id']], kb)
@@ -0,0 +1,96 @@
+import asyncio
+import contextvars
+from asyncio import AbstractEventLoop
+from collections import deque
+from time import monotonic
+
+from Handlers.router import Router
+
+
+class EventSupervisor:
+    def __init__(
+            self,
+            router: Router,
+            messangers: list,
+            event_loop: AbstractEventLoop,
+            workers: int = 32,
+            max_queue: int = 1000
+    ):
+        self._router = router
+        self._messangers = {messanger.get_name(): messanger for messanger in messangers}
+        self._event_loop = event_loop
+        self._max_queue = max_queue
+        self._mailboxes = {}
+        self._ready = asyncio.Queue()
+        self._queued = 0
+        self._replies = set()
+        self._metrics = {"processed": 0, "shed": 0, "failed": 0, "wait sum": 0.0, "max wait": 0.0}
+        self._workers = [event_loop.create_task(self._work()) for _ in range(workers)]
+
+    def get_status(self) -> dict:
+        processed = self._metrics["processed"]
+        now = monotonic()
+        return {
+            "workers": sum(not worker.done() for worker in self._workers),
+            "queue depth": self._queued,
+            "active users": len(self._mailboxes),
+            "oldest event age": round(max(
+                (now - mailbox[0][0] for mailbox in self._mailboxes.values() if mailbox), default=0
+            ), 3),
+            "processed": processed,
+            "shed": self._metrics["shed"],
+            "failed": self._metrics["failed"],
+            "average wait": round(self._metrics["wait sum"] / processed, 3) if processed else 0,
+            "max wait": round(self._metrics["max wait"], 3)
+        }
+
+    def submit(self, event: dict) -> asyncio.Future:
+        future = self._event_loop.create_future()
+        if event is None:
+            future.set_result(None)
+            return future
+        if self._queued >= self._max_queue:
+            self._metrics["shed"] += 1
+            return self._track(asyncio.ensure_future(self._send_busy_reply(event)))
+        key = (event['platform'], event['from_id'])
+        if key not in self._mailboxes:
+            self._mailboxes[key] = deque()
+            self._ready.put_nowait(key)
+        self._mailboxes[key].append((monotonic(), event, contextvars.copy_context(), future))
+        self._queued += 1
+        return future
+
+    async def _work(self) -> None:
+        while True:
+            key = await self._ready.get()
+            enqueued_at, event, context, future = self._mailboxes[key].popleft()
+            self._queued -= 1
+            wait = monotonic() - enqueued_at
+            self._metrics["wait sum"] += wait
+            self._metrics["max wait"] = max(self._metrics["max wait"], wait)
+            try:
+                await context.run(asyncio.ensure_future, self._router.handle_event(event))
+                self._metrics["processed"] += 1
+            except Exception as err:
+                self._metrics["failed"] += 1
+                print(f"{err.__class__.__name__}: {err}")
+            finally:
+                if not future.done():
+                    future.set_result(None)
+                if self._mailboxes[key]:
+                    self._ready.put_nowait(key)
+                else:
+                    del self._mailboxes[key]
+
+    async def _send_busy_reply(self, event: dict) -> None:
+        chat_platform = self._messangers[event['platform']]
+        await chat_platform.send_message(
+            "Бот сейчас перегружен. Пожалуйста, повторите запрос через минуту.",
+            [event['from_id']],
+            chat_platform.get_keyboard_inst().get_standard_keyboard()
+        )
+
+    def _track(self, task: asyncio.Future) -> asyncio.Future:
+        self._replies.add(task)
+        task.add_done_callback(self._replies.discard)
+        return task
@@ -0,0 +1,164 @@
+import asyncio
+from asyncio import AbstractEventLoop
+from datetime import timedelta
+from time import monotonic
+
+from APIs.Chsu.client import Chsu
+from APIs.Chsu.schedule import Schedule
+from APIs.Dispatcher.dispatcher import OutboundDispatcher
+from APIs.Telegram.client import Telegram
+from APIs.Vk.client import Vk
+from Handlers.date_handler import DateHandler
+from Wrappers.abstract_storage import Storage
+from Exceptions.empty_response import EmptyResponse
+
+
+class MailingScheduler:
+    def __init__(
+            self,
+            vk: Vk,
+            telegram: Telegram,
+            database: Storage,
+            chsu_api: Chsu,
+            event_loop: AbstractEventLoop,
+            workers: int = 4,
+            plan_ttl: float = 10 * 60,
+            prefetch_lead: float = 30,
+            render_concurrency: int = 10
+    ):
+        self._messangers = {vk.get_name(): vk, telegram.get_name(): telegram}
+        self._database = database
+        self._chsu_api = chsu_api
+        self._plan_ttl = plan_ttl
+        self._prefetch_lead = prefetch_lead
+        self._render_semaphore = asyncio.Semaphore(render_concurrency)
+        self._plan = {}
+        self._plan_built_at = None
+        self._plan_version = None
+        self._deliveries = asyncio.Queue()
+        self._metrics = {
+            "last deadline": None,
+            "wake lag": 0.0,
+            "prepare duration": 0.0,
+            "delivered": 0,
+            "failed": 0,
+            "delivery lag sum": 0.0,
+            "max delivery lag": 0.0
+        }
+        self._workers = [event_loop.create_task(self._deliver()) for _ in range(workers)]
+        self.mailing = event_loop.create_task(self._mailing_process())
+
+    def get_status(self) -> dict:
+        delivered = self._metrics["delivered"]
+        return {
+            "status": 'working' if not self.mailing.done() else 'not working',
+            "subscribers": sum(
+                len(peer_ids) for groups in self._plan.values()
+                for platforms in groups.values() for peer_ids in platforms.values()
+            ),
+            "last deadline": self._metrics["last deadline"],
+            "wake lag": round(self._metrics["wake lag"], 3),
+            "prepare duration": round(self._metrics["prepare duration"], 3),
+            "queue depth": self._deliveries.qsize(),
+            "delivered": delivered,
+            "failed": self._metrics["failed"],
+            "average delivery lag": round(self._metrics["delivery lag sum"] / delivered, 3) if delivered else 0,
+            "max delivery lag": round(self._metrics["max delivery lag"], 3)
+        }
+
+    async def _mailing_process(self):
+        now = DateHandler().get_current_date_object()
+        deadline = now.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        while True:
+            await self._sleep_until(deadline - timedelta(seconds=self._prefetch_lead))
+            try:
+                deliveries = await self._prepare_deadline(deadline)
+            except Exception as err:
+                print(f"{err.__class__.__name__}: {err}")
+                deliveries = []
+            await self._sleep_until(deadline)
+            self._run_deadline(deadline, deliveries)
+            deadline += timedelta(minutes=1)
+
+    @staticmethod
+    async def _sleep_until(moment):
+        await asyncio.sleep(max((moment - DateHandler().get_current_date_object()).total_seconds(), 0))
+
+    async def _prepare_deadline(self, deadline) -> list:
+        started = monotonic()
+        if self._plan_version != self._database.get_mailing_version() or \
+                monotonic() - self._plan_built_at > self._plan_ttl:
+            await self._build_plan()
+        tomorrow = (deadline + timedelta(days=1)).strftime("%d.%m.%Y")
+        groups = list(self._plan.get(deadline.strftime("%H:%M"), {}).items())
+        all_days = await asyncio.gather(*[self._get_days_limited(name, tomorrow) for name, _ in groups])
+        deliveries = []
+        for (name, platforms), days in zip(groups, all_days):
+            for platform, peer_ids in platforms.items():
+                messanger = self._messangers[platform]
+                payloads = [(day['text'], self._get_keyboard(messanger, day)) for day in days]
+                deliveries.append((messanger, peer_ids, payloads))
+        self._metrics["prepare duration"] = monotonic() - started
+        return deliveries
+
+    def _run_deadline(self, deadline, deliveries: list) -> None:
+        self._metrics["wake lag"] = (DateHandler().get_current_date_object() - deadline).total_seconds()
+        self._metrics["last deadline"] = deadline.strftime("%d.%m.%Y %H:%M")
+        deadline_at = monotonic() - self._metrics["wake lag"]
+        for messanger, peer_ids, payloads in deliveries:
+            self._deliveries.put_nowait((deadline_at, messanger, peer_ids, payloads))
+
+    async def _get_days_limited(self, name: str, date: str) -> list:
+        async with self._render_semaphore:
+            return await self._get_days(name, date)
+
+    async def _build_plan(self):
+        plan = {}
+        version = self._database.get_mailing_version()
+        for subscriber in await self._database.get_mailing_subscribers():
+            name = subscriber.get("group_name") or subscriber.get("professor_name")
+            if name and subscriber["platform"] in self._messangers:
+                plan.setdefault(subscriber["mailing_time"], {}) \
+                    .setdefault(name, {}) \
+                    .setdefault(subscriber["platform"], []).append(subscriber["id"])
+        self._plan = plan
+        self._plan_version = version
+        self._plan_built_at = monotonic()
+
+    async def _get_days(self, name: str, date: str) -> list:
+        try:
+            return list(await self._chsu_api.get_schedule_list_string(name, date))
+        except EmptyResponse as err:
+            print(f"{err.__class__.__name__}: {err}")
+            return []
+        except ConnectionError as err:
+            return [{
+                "text": f"Произошла ошибка при запросе расписания: {err}. "
+                        f"Попробуйте запросить его снова или свяжитесь с администратором.",
+                "callback_data": []
+            }]
+
+    async def _deliver(self):
+        while True:
+            deadline_at, messanger, peer_ids, payloads = await self._deliveries.get()
+            failed_peers = set()
+            try:
+                for text, keyboard in payloads:
+                    statuses = await messanger.send_message(text, peer_ids, keyboard, OutboundDispatcher.BULK)
+                    failed_peers.update(peer_id for peer_id, status in statuses.items() if status is not True)
+            except Exception as err:
+                print(f"{err.__class__.__name__}: {err}")
+                failed_peers.update(peer_ids)
+            lag = monotonic() - deadline_at
+            self._metrics["delivered"] += len(peer_ids) - len(failed_peers)
+            self._metrics["failed"] += len(failed_peers)
+            self._metrics["delivery lag sum"] += lag * (len(peer_ids) - len(failed_peers))
+            self._metrics["max delivery lag"] = max(self._metrics["max delivery lag"], lag)
+
+    @staticmethod
+    def _get_keyboard(messanger, day):
+        keyboard = messanger.get_keyboard_inst()
+        if len(day['callback_data']) > 0:
+            address_codes = list(map(lambda a: Schedule.get_address_code(a), day['callback_data']))
+            return keyboard.get_geo_request_keyboard(day['callback_data'], address_codes)
+        return keyboard.get_standard_keyboard()
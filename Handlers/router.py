@@ -0,0 +1,48 @@
+import re
+
+
+class Router:
+    def __init__(self, handlers: list):
+        self._handlers_by_command = {}
+        self._handlers_by_group = {}
+        self._predicate_handlers = []
+        self._hits = {}
+        patterns = []
+        for handler in handlers:
+            handler.set_next(self)
+            self._hits[handler.__class__.__name__] = 0
+            for command in handler.get_commands():
+                self._handlers_by_command.setdefault(command, handler)
+            if handler.get_pattern() is not None:
+                group = f"route{len(patterns)}"
+                self._handlers_by_group[group] = handler
+                patterns.append(f"(?P<{group}>{handler.get_pattern()})")
+            if not handler.get_commands() and handler.get_pattern() is None:
+                self._predicate_handlers.append(handler)
+        self._pattern = re.compile("|".join(patterns)) if patterns else None
+
+    def get_status(self) -> dict:
+        return self._hits
+
+    async def handle_event(self, event: dict) -> None:
+        handler = await self._route(event)
+        if handler is not None:
+            self._hits[handler.__class__.__name__] += 1
+            await handler.process_event(event)
+
+    async def _route(self, event: dict):
+        if event is None:
+            return None
+        if 'text' in event:
+            if event['text'] in self._handlers_by_command:
+                return self._handlers_by_command[event['text']]
+            found = self._pattern.match(event['text']) if self._pattern is not None else None
+            if found is not None:
+                return self._handlers_by_group[found.lastgroup]
+        for handler in self._predicate_handlers:
+            try:
+                if await handler.can_handle(event):
+                    return handler
+            except Exception as err:
+                print(f"{err.__class__.__name__}: {err}")
+        return None
@@ -1,12 +1,15 @@
 import asyncio
 from asyncio import AbstractEventLoop
+from time import monotonic
 
 from APIs.Chsu.client import Chsu
 from APIs.Chsu.schedule import Schedule
+from APIs.Chsu.schedule_diff import ScheduleDiff
+from APIs.Dispatcher.dispatcher import OutboundDispatcher
 from APIs.Telegram.client import Telegram
 from APIs.Vk.client import Vk
 from Handlers.date_handler import DateHandler
-from Wrappers.MongoDb.database import MongoDB
+from Wrappers.abstract_storage import Storage
 from Exceptions.empty_response import EmptyResponse
 
 
@@ -15,21 +18,31 @@ class ScheduleChecker:
             self,
             vk: Vk,
             telegram: Telegram,
-            database: MongoDB,
+            database: Storage,
             chsu_api: Chsu,
-            event_loop: AbstractEventLoop
+            event_loop: AbstractEventLoop,
+            concurrency: int = 10,
+            group_timeout: float = 120,
+            bulk_sweep: bool = True
     ):
         self._vk = vk
         self._telegram = telegram
         self._database = database
         self._chsu_api = chsu_api
         self._date_handler = DateHandler()
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._group_timeout = group_timeout
+        self._bulk_sweep = bulk_sweep
+        self._sweep_report = {}
         self.checking = event_loop.create_task(self._check_updates_process())
         self._is_has_been_updated = True
 
     def get_status(self):
         return 'working' if not self.checking.done() else 'not working'
 
+    def get_sweep_report(self):
+        return self._sweep_report
+
     async def _check_updates_process(self):
         while True:
             try:
@@ -42,71 +55,69 @@ class ScheduleChecker:
 
     async def _check_updates(self):
         if await self._is_update_time():
+            start_time = self._date_handler.get_current_date_object()
+            started = monotonic()
             group_list = await self._database.get_groups_list()
-            for group in group_list:
-                await self._check_and_send_updates_for_group(group)
+            schedules = await self._get_bulk_schedules() if self._bulk_sweep else {}
+            results = await asyncio.gather(
+                *[self._check_group(group, schedules.get(group)) for group in group_list],
+                return_exceptions=True
+            )
+            failures = {
+                group: f"{result.__class__.__name__}: {result}"
+                for group, result in zip(group_list, results) if isinstance(result, Exception)
+            }
+            self._sweep_report = {
+                "started at": start_time.strftime("%d.%m.%Y %H:%M:%S"),
+                "duration": round(monotonic() - started, 3),
+                "bulk sweep": len(schedules) > 0,
+                "groups checked": len(group_list) - len(failures),
+                "failures": failures,
+                "changes found": sum(result for result in results if isinstance(result, int))
+            }
         self._is_has_been_updated = True
 
+    async def _get_bulk_schedules(self):
+        date_handler = DateHandler()
+        date_handler.parse_interval(days=14)
+        try:
+            return await self._chsu_api.update_schedule_store_bulk(*date_handler.get_string())
+        except Exception as err:
+            print(f"{err.__class__.__name__}: {err}")
+            return {}
+
+    async def _check_group(self, group, schedule=None):
+        async with self._semaphore:
+            return await self._check_and_send_updates_for_group(group, schedule)
+
     async def _is_update_time(self):
         return \
             self._date_handler.get_current_date_object().second == 0 and \
             self._date_handler.get_current_date_object().minute % 20 == 0
 
-    async def _check_and_send_updates_for_group(self, group):
+    async def _check_and_send_updates_for_group(self, group, schedule=None):
         users = await self._database.get_check_changes_members(group)
-        response = await self._get_new_schedules(group)
+        response, fingerprints = await asyncio.wait_for(self._get_changes(group, schedule), self._group_timeout)
         if self._is_has_been_updated:
             await self._send_responses(users, response)
+        if fingerprints is not None:
+            await self._database.set_group_fingerprints(fingerprints, group)
+        return len(response)
 
-    async def _get_new_schedules(self, group):
-        response = []
-        for time in await self._update_group_and_get_changes(group) or []:
-            for schedule in await self._chsu_api.get_schedule_list_string(group, time):
-                response.append(
-                    (f"Обновленное расписание:\n\n{schedule['text']}", schedule['callback_data'])
-                )
-        return response
-
-    async def _update_group_and_get_changes(self, group_name):
-        self._date_handler.parse_interval(days=14)
+    async def _get_changes(self, group_name, schedule=None):
+        date_handler = DateHandler()
+        date_handler.parse_interval(days=14)
         try:
-            new_hashes = await self._chsu_api.get_schedule_list_hash(group_name, *self._date_handler.get_string())
-            group_obj = await self._database.get_group_hashes(group_name)
-            await self._database.set_group_hashes(new_hashes, group_name)
-            return list(filter(
-                lambda x:
-                not (
-                    x == self._date_handler.get_string()[1] and
-                    self._date_handler.get_current_date_object().hour == 0
-                ),
-                self._get_difference_dates(new_hashes, group_obj)
-            ))
+            if schedule is None:
+                schedule = await self._chsu_api.update_schedule_store(group_name, *date_handler.get_string())
+            new_fingerprints = ScheduleDiff.get_fingerprints(schedule.get_couples(), *date_handler.get_string())
+            old_fingerprints = await self._database.get_group_fingerprints(group_name)
+            return ScheduleDiff(await self._chsu_api.get_user_type(group_name)).get_messages(
+                old_fingerprints, new_fingerprints
+            ), new_fingerprints
         except EmptyResponse as err:
             print(f"{err.__class__.__name__}: {err}")
-            return []
-
-    def _get_difference_dates(self, hashes: list, group: dict) -> list:
-        return self._get_difference_dates_and_update_hashes(group['hashes'], hashes) if 'hashes' in group else []
-
-    def _get_difference_dates_and_update_hashes(self, old_hashes: list, new_hashes: list) -> list:
-        hashes = self._get_difference(old_hashes, new_hashes)
-        objects = self._find_full_objects(hashes, new_hashes)
-        return self._get_date_strings(objects)
-
-    def _get_difference(self, old_hashes: list, new_hashes: list) -> list:
-        return list(set(self._get_hashes(new_hashes)) - set(self._get_hashes(old_hashes)))
-
-    @staticmethod
-    def _get_hashes(dates_and_hashes: list) -> list:
-        return list(map(lambda date_and_hash: date_and_hash['hash'], dates_and_hashes))
-
-    @staticmethod
-    def _find_full_objects(hashes: list, object_list: list) -> list:
-        return list(filter(lambda date_hash: date_hash['hash'] in hashes, object_list))
-
-    @staticmethod
-    def _get_date_strings(object_list: list) -> list:
-        return list(map(lambda date_and_hash: date_and_hash['time'].strftime("%d.%m.%Y"), object_list))
+            return [], None
 
     async def _send_responses(self, users, response):
         for message in response:
@@ -132,5 +143,6 @@ class ScheduleChecker:
                     lambda a: Schedule.get_address_code(a),
                     message[1]
                 ))
-            )
+            ),
+            OutboundDispatcher.BULK
         )
@@ -4,8 +4,45 @@ from json import dumps
 class Keyboard:
     def __init__(self) -> None:
         self._keyboard = None
+        self._geo_request_keyboards = {}
+        self._keyboards = {
+            "standard": self._build_standard_keyboard(),
+            "start": self._build_start_keyboard(),
+            "change_group": self._build_change_group_keyboard(),
+            "canceling": self._build_canceling_keyboard(),
+            "canceling_subscribe": self._build_canceling_subscribe_keyboard(),
+            "settings": self._build_settings_keyboard(),
+            "set_check_changes": self._build_set_check_changes_keyboard()
+        }
 
     def get_standard_keyboard(self) -> str:
+        return self._keyboards["standard"]
+
+    def get_start_keyboard(self) -> str:
+        return self._keyboards["start"]
+
+    def get_change_group_keyboard(self) -> str:
+        return self._keyboards["change_group"]
+
+    def get_canceling_keyboard(self) -> str:
+        return self._keyboards["canceling"]
+
+    def get_canceling_subscribe_keyboard(self) -> str:
+        return self._keyboards["canceling_subscribe"]
+
+    def get_settings_keyboard(self) -> str:
+        return self._keyboards["settings"]
+
+    def get_set_check_changes_keyboard(self) -> str:
+        return self._keyboards["set_check_changes"]
+
+    def get_geo_request_keyboard(self, text: list, payloads: list) -> str:
+        key = (tuple(text), tuple(payloads))
+        if key not in self._geo_request_keyboards:
+            self._geo_request_keyboards[key] = self._build_geo_request_keyboard(text, payloads)
+        return self._geo_request_keyboards[key]
+
+    def _build_standard_keyboard(self) -> str:
         self._clear()
         self._add_line()
         self._add_button("Расписание на сегодня", "primary")
@@ -16,14 +53,14 @@ class Keyboard:
         self._add_button("Настройки", "negative")
         return self._get_keyboard()
 
-    def get_start_keyboard(self) -> str:
+    def _build_start_keyboard(self) -> str:
         self._clear()
         self._add_line()
         self._add_button("Преподаватель", "primary")
         self._add_button("Студент", "primary")
         return self._get_keyboard()
 
-    def get_change_group_keyboard(self):
+    def _build_change_group_keyboard(self) -> str:
         self._clear()
         self._add_line()
         self._add_button("Преподаватель", "primary")
@@ -32,13 +69,13 @@ class Keyboard:
         self._add_button("Отмена", "negative")
         return self._get_keyboard()
 
-    def get_canceling_keyboard(self) -> str:
+    def _build_canceling_keyboard(self) -> str:
         self._clear()
         self._add_line()
         self._add_button("Отмена", "negative")
         return self._get_keyboard()
 
-    def get_canceling_subscribe_keyboard(self) -> str:
+    def _build_canceling_subscribe_keyboard(self) -> str:
         self._clear()
         self._add_line()
         self._add_button("Отмена", "secondary")
@@ -46,7 +83,7 @@ class Keyboard:
         self._add_button("Отписаться", "negative")
         return self._get_keyboard()
 
-    def get_settings_keyboard(self) -> str:
+    def _build_settings_keyboard(self) -> str:
         self._clear()
         self._add_line()
         self._add_button("Рассылка", "positive")
@@ -56,14 +93,14 @@ class Keyboard:
         self._add_button("Отмена", "secondary")
         return self._get_keyboard()
 
-    def get_set_check_changes_keyboard(self) -> str:
+    def _build_set_check_changes_keyboard(self) -> str:
         self._clear()
         self._add_line()
         self._add_button("Отслеживать изменения", "positive")
         self._add_button("Не отслеживать изменения", "negative")
         return self._get_keyboard()
 
-    def get_geo_request_keyboard(self, text: list, payloads: list):
+    def _build_geo_request_keyboard(self, text: list, payloads: list) -> str:
         self._clear(True)
         for index in range(len(text)):
             if text[index]:
@@ -71,6 +108,15 @@ class Keyboard:
                 self._add_payload_button(text[index], payloads[index], "primary")
         return self._get_keyboard()
 
+    def get_suggestions_keyboard(self, names: list) -> str:
+        self._clear()
+        for name in names:
+            self._add_line()
+            self._add_button(name, "primary")
+        self._add_line()
+        self._add_button("Отмена", "negative")
+        return self._get_keyboard()
+
     @staticmethod
     def get_empty_keyboard():
         return None
@@ -1,19 +1,104 @@
+import asyncio
+import random
 from asyncio import AbstractEventLoop
+from time import monotonic
+from urllib.parse import urlsplit
 
 import aiohttp
 
+from Wrappers.AIOHttp.circuit_breaker import CircuitBreaker
+
 
 class AIOHttpWrapper:
-    def __init__(self, event_loop: AbstractEventLoop):
-        self._session = aiohttp.ClientSession(loop=event_loop)
+    def __init__(
+            self,
+            event_loop: AbstractEventLoop,
+            limit: int = 100,
+            limit_per_host: int = 20,
+            keepalive_timeout: float = 30,
+            dns_cache_ttl: int = 300,
+            total_timeout: float = 30,
+            connect_timeout: float = 5,
+            read_timeout: float = 20,
+            retries: int = 2,
+            backoff: float = 0.3,
+            failure_threshold: int = 5,
+            reset_timeout: float = 30
+    ):
+        self._session = aiohttp.ClientSession(
+            loop=event_loop,
+            connector=aiohttp.TCPConnector(
+                loop=event_loop,
+                limit=limit,
+                limit_per_host=limit_per_host,
+                keepalive_timeout=keepalive_timeout,
+                ttl_dns_cache=dns_cache_ttl
+            ),
+            timeout=aiohttp.ClientTimeout(total=total_timeout, connect=connect_timeout, sock_read=read_timeout)
+        )
+        self._retries = retries
+        self._backoff = backoff
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._breakers = {}
+        self._metrics = {}
 
     def get_client(self):
         return self._session
 
-    async def post(self, url: str, json: dict = None, headers: dict = None):
-        async with self._session.post(url=url, json=json, headers=headers) as response:
-            return await response.json()
+    def get_status(self) -> dict:
+        return {
+            host: {
+                **metrics,
+                "average latency": round(metrics["latency sum"] / metrics["requests"], 3) if metrics["requests"] else 0,
+                "circuit": self._breakers[host].get_status()
+            } for host, metrics in self._metrics.items()
+        }
+
+    async def post(self, url: str, json: dict = None, headers: dict = None, data: bytes = None):
+        return await self._request("POST", url, 0, json=json, headers=headers, data=data)
+
+    async def get(self, url: str, headers: dict = None, params: dict = None, retry: bool = True):
+        return await self._request("GET", url, self._retries if retry else 0, headers=headers, params=params)
+
+    async def _request(self, method: str, url: str, retries: int, **kwargs):
+        host = urlsplit(url).netloc
+        breaker = self._get_breaker(host)
+        metrics = self._metrics[host]
+        attempt = 0
+        while True:
+            breaker.before_request()
+            metrics["requests"] += 1
+            started_at = monotonic()
+            try:
+                async with self._session.request(method, url, **kwargs) as response:
+                    if response.status >= 500:
+                        response.raise_for_status()
+                    result = await response.json()
+            except asyncio.CancelledError:
+                breaker.record_cancel()
+                raise
+            except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+                metrics["latency sum"] += monotonic() - started_at
+                metrics["timeouts" if isinstance(err, asyncio.TimeoutError) else "failures"] += 1
+                breaker.record_failure()
+                if attempt >= retries:
+                    raise
+                attempt += 1
+                metrics["retries"] += 1
+                await asyncio.sleep(random.uniform(0, self._backoff * 2 ** attempt))
+                continue
+            except Exception:
+                metrics["latency sum"] += monotonic() - started_at
+                metrics["failures"] += 1
+                breaker.record_failure()
+                raise
+            metrics["latency sum"] += monotonic() - started_at
+            breaker.record_success()
+            return result
 
-    async def get(self, url: str, headers: dict = None, params: dict = None):
-        async with self._session.get(url=url, headers=headers, params=params) as response:
-            return await response.json()
+    def _get_breaker(self, host: str) -> CircuitBreaker:
+        if host not in self._breakers:
+            self._breakers[host] = CircuitBreaker(host, self._failure_threshold, self._reset_timeout)
+            self._metrics[host] = {"requests": 0, "failures": 0, "timeouts": 0, "retries": 0, "latency sum": 0.0}
+        return self._breakers[host]
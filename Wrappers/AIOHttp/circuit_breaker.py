@@ -0,0 +1,58 @@
+from time import monotonic
+
+from Exceptions.circuit_open import CircuitOpen
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, host: str, failure_threshold: int = 5, reset_timeout: float = 30):
+        self._host = host
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        self._rejected = 0
+        self._opened = 0
+
+    def get_status(self) -> dict:
+        return {
+            "state": self._state,
+            "consecutive failures": self._failures,
+            "opened": self._opened,
+            "rejected": self._rejected
+        }
+
+    def before_request(self) -> None:
+        if self._state == self.OPEN:
+            retry_after = self._reset_timeout - (monotonic() - self._opened_at)
+            if retry_after > 0:
+                self._rejected += 1
+                raise CircuitOpen(f"{self._host} is unavailable, retry in {retry_after:.0f}s", retry_after)
+            self._state = self.HALF_OPEN
+        if self._state == self.HALF_OPEN:
+            if self._trial_in_flight:
+                self._rejected += 1
+                raise CircuitOpen(f"{self._host} is being probed", self._reset_timeout)
+            self._trial_in_flight = True
+
+    def record_success(self) -> None:
+        self._state = self.CLOSED
+        self._failures = 0
+        self._trial_in_flight = False
+
+    def record_cancel(self) -> None:
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._trial_in_flight = False
+        if self._state == self.HALF_OPEN or self._failures >= self._failure_threshold:
+            if self._state != self.OPEN:
+                self._opened += 1
+            self._state = self.OPEN
+            self._opened_at = monotonic()
@@ -0,0 +1,115 @@
+import asyncio
+from collections import OrderedDict
+from time import monotonic
+
+
+class TTLCache:
+    def __init__(self, max_size: int = 1024, ttl: float = 600, stale_ttl: float = 0, stale_if_error: float = 0):
+        self._max_size = max_size
+        self._ttl = ttl
+        self._stale_ttl = stale_ttl
+        self._stale_if_error = stale_if_error
+        self._entries = OrderedDict()
+        self._in_flight = {}
+        self._hits = 0
+        self._misses = 0
+        self._coalesced = 0
+        self._evictions = 0
+        self._stale = 0
+        self._stale_if_error_served = 0
+        self._revalidation_failures = 0
+
+    def get_status(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "max size": self._max_size,
+            "in flight": len(self._in_flight),
+            "hits": self._hits,
+            "misses": self._misses,
+            "coalesced": self._coalesced,
+            "evictions": self._evictions,
+            "stale": self._stale,
+            "stale if error": self._stale_if_error_served,
+            "revalidation failures": self._revalidation_failures
+        }
+
+    async def get_or_load(self, key, loader):
+        return (await self.get_or_load_with_age(key, loader))[0]
+
+    async def get_or_load_with_age(self, key, loader) -> tuple:
+        entry = self._get_entry(key)
+        age = monotonic() - entry[1] if entry is not None else None
+        if entry is not None and age <= self._ttl:
+            self._hits += 1
+            return entry[0], None
+        if entry is not None and age <= self._ttl + self._stale_ttl:
+            self._stale += 1
+            if key not in self._in_flight:
+                self._start_load(key, loader).add_done_callback(self._on_revalidated)
+            return entry[0], age
+        if key in self._in_flight:
+            self._coalesced += 1
+        else:
+            self._misses += 1
+            self._start_load(key, loader)
+        try:
+            return await asyncio.shield(self._in_flight[key]), None
+        except Exception:
+            if entry is None or age > self._ttl + self._stale_if_error:
+                raise
+            self._stale_if_error_served += 1
+            return entry[0], age
+
+    async def refresh(self, key, loader):
+        if key not in self._in_flight:
+            self._start_load(key, loader)
+        return await asyncio.shield(self._in_flight[key])
+
+    def get(self, key):
+        entry = self._get_entry(key)
+        return entry[0] if entry is not None and monotonic() - entry[1] <= self._ttl else None
+
+    def set(self, key, value) -> None:
+        self._in_flight.pop(key, None)
+        self._entries[key] = (value, monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def invalidate(self, key) -> None:
+        self._in_flight.pop(key, None)
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def _start_load(self, key, loader):
+        self._in_flight[key] = asyncio.ensure_future(self._load(key, loader))
+        return self._in_flight[key]
+
+    def _on_revalidated(self, task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            self._revalidation_failures += 1
+            print(f"{task.exception().__class__.__name__}: {task.exception()}")
+
+    async def _load(self, key, loader):
+        task = asyncio.current_task()
+        try:
+            value = await loader()
+            if self._in_flight.get(key) is task:
+                self.set(key, value)
+            return value
+        finally:
+            if self._in_flight.get(key) is task:
+                del self._in_flight[key]
+
+    def _get_entry(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if monotonic() - entry[1] > self._ttl + max(self._stale_ttl, self._stale_if_error):
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
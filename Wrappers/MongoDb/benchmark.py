@@ -0,0 +1,82 @@
+import argparse
+import asyncio
+import random
+from statistics import mean, quantiles
+from time import perf_counter
+
+from Wrappers.MongoDb.database import MongoDB
+
+
+async def _measure(calls: list) -> dict:
+    latencies = []
+    for call in calls:
+        started_at = perf_counter()
+        await call()
+        latencies.append((perf_counter() - started_at) * 1000)
+    percentiles = quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    return {
+        "calls": len(latencies),
+        "mean ms": round(mean(latencies), 3),
+        "p50 ms": round(percentiles[49], 3),
+        "p95 ms": round(percentiles[94], 3)
+    }
+
+
+async def run(url: str, db_name: str, users: int, calls: int) -> dict:
+    database = MongoDB(None, None, db_name, url=url)
+    await database._users_collection.delete_many({})
+    await database._groups_collection.delete_many({})
+    await database._requests_collection.delete_many({})
+    await database.ensure_indexes()
+    groups = [f"1ПИб-{index:02}-1оп" for index in range(100)]
+    await database._users_collection.insert_many([{
+        "id": user_id,
+        "platform": "vk" if user_id % 2 else "telegram",
+        "group_name": groups[user_id % len(groups)],
+        **({"mailing_time": f"{user_id % 24:02}:00"} if user_id % 5 == 0 else {})
+    } for user_id in range(users)])
+    user_ids = random.sample(range(users), min(calls, users))
+
+    def get_platform(user_id):
+        return "vk" if user_id % 2 else "telegram"
+
+    report = {
+        "get_user_data": await _measure([
+            lambda user_id=user_id: database.get_user_data(user_id, get_platform(user_id)) for user_id in user_ids
+        ]),
+        "get_user_data (cached)": await _measure([
+            lambda user_id=user_id: database.get_user_data(user_id, get_platform(user_id)) for user_id in user_ids
+        ]),
+        "set_mailing_time": await _measure([
+            lambda user_id=user_id: database.set_mailing_time(user_id, get_platform(user_id), "07:30")
+            for user_id in user_ids
+        ]),
+        "get_mailing_subscribers": await _measure([database.get_mailing_subscribers] * max(calls // 100, 1)),
+        "set_check_changes_member": await _measure([
+            lambda user_id=user_id: database.set_check_changes_member(user_id, get_platform(user_id), True)
+            for user_id in user_ids
+        ]),
+        "get_group_fingerprints": await _measure([
+            lambda group=group: database.get_group_fingerprints(group) for group in groups
+        ]),
+        "set_user_data": await _measure([
+            lambda user_id=user_id: database.set_user_data(user_id, get_platform(user_id), random.choice(groups))
+            for user_id in user_ids
+        ]),
+        "query plans": await database.audit_query_plans()
+    }
+    await database.flush_request_log()
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Seed a local mongod and measure MongoDB method latency. The database is wiped first.")
+    parser.add_argument("--url", default="mongodb://localhost:27017")
+    parser.add_argument("--db-name", default="schedule_benchmark")
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--calls", type=int, default=1000)
+    arguments = parser.parse_args()
+    for method_name, result in asyncio.run(
+            run(arguments.url, arguments.db_name, arguments.users, arguments.calls)
+    ).items():
+        print(f"{method_name}: {result}")
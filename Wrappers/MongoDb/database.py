@@ -1,11 +1,18 @@
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, DeleteOne, UpdateOne
+from pymongo.errors import BulkWriteError
 
 from Exceptions.empty_response import EmptyResponse
+from Wrappers.Cache.ttl_cache import TTLCache
+from Wrappers.abstract_storage import Storage
+from Wrappers.request_log import RequestLog
 
 
-class MongoDB:
-    def __init__(self, db_login: str, db_password: str, db_name: str):
+class MongoDB(Storage):
+    def __init__(self, db_login: str, db_password: str, db_name: str, url: str = None):
+        super().__init__()
         client = AsyncIOMotorClient(
+            url or
             f"mongodb+srv://{db_login}:{db_password}"
             f"@cluster.rfoam.mongodb.net/"
             f"{db_name}?"
@@ -15,6 +22,9 @@ class MongoDB:
         )
         self._users_collection = client[db_name]["Users"]
         self._groups_collection = client[db_name]["Groups"]
+        self._requests_collection = client[db_name]["Requests"]
+        self._request_log = RequestLog(self._write_requests)
+        self._profiles = TTLCache(max_size=20000, ttl=30 * 60)
 
     async def get_status(self):
         if (await self._users_collection.find_one({"id": 447828812}))["platform"] == 'vk':
@@ -22,13 +32,74 @@ class MongoDB:
         else:
             return "not working"
 
+    async def ensure_indexes(self) -> None:
+        for collection, keys, options in (
+                (self._users_collection, [("id", ASCENDING), ("platform", ASCENDING)], {"unique": True}),
+                (self._users_collection, [("mailing_time", ASCENDING)], {"sparse": True}),
+                (self._groups_collection, [("name", ASCENDING)], {"unique": True}),
+                (self._requests_collection, [("platform", ASCENDING), ("id", ASCENDING), ("hour", ASCENDING)], {})
+        ):
+            try:
+                await collection.create_index(keys, **options)
+            except Exception as err:
+                print(f"{err.__class__.__name__}: {err}")
+
+    async def audit_query_plans(self) -> dict:
+        queries = {
+            "get_user_data": (self._users_collection, {"id": 0, "platform": "vk"}),
+            "set_mailing_time": (self._users_collection, {"id": 0, "platform": "vk"}),
+            "get_mailing_subscribers": (self._users_collection, {"mailing_time": {"$exists": True}}),
+            "get_check_changes_members": (self._groups_collection, {"name": ""}),
+            "set_check_changes_member": (self._groups_collection, {"name": ""}),
+            "get_group_fingerprints": (self._groups_collection, {"name": ""}),
+            "request_log": (self._requests_collection, {"platform": "vk", "id": 0, "hour": None})
+        }
+        report = {}
+        for method_name, (collection, query) in queries.items():
+            try:
+                plan = (await collection.find(query).explain())["queryPlanner"]["winningPlan"]
+            except Exception as err:
+                report[method_name] = f"{err.__class__.__name__}: {err}"
+                continue
+            stages = list(self._get_plan_stages(plan))
+            report[method_name] = {"stages": stages, "collection scan": "COLLSCAN" in stages}
+        return report
+
+    @classmethod
+    def _get_plan_stages(cls, plan: dict):
+        yield plan["stage"]
+        for child in ([plan["inputStage"]] if "inputStage" in plan else []) + plan.get("inputStages", []):
+            yield from cls._get_plan_stages(child)
+
+    def get_request_log_status(self) -> dict:
+        return self._request_log.get_status()
+
+    async def _write_requests(self, times_by_bucket: dict) -> list:
+        buckets = list(times_by_bucket.items())
+        try:
+            await self._requests_collection.bulk_write([
+                UpdateOne(
+                    {"platform": api_name, "id": platform_id, "hour": hour},
+                    {"$push": {"requests_time": {"$each": times}}, "$inc": {"count": len(times)}},
+                    upsert=True
+                ) for (api_name, platform_id, hour), times in buckets
+            ], ordered=False)
+        except BulkWriteError as err:
+            print(f"{err.__class__.__name__}: {err}")
+            return [buckets[error["index"]][0] for error in err.details.get("writeErrors", [])]
+        return []
+
+    async def flush_request_log(self) -> None:
+        await self._request_log.flush()
+
+    def get_profile_cache_status(self) -> dict:
+        status = self._profiles.get_status()
+        requests_count = status["hits"] + status["misses"] + status["coalesced"]
+        return {**status, "hit ratio": round(status["hits"] / requests_count, 3) if requests_count else 0}
+
     async def get_user_data(self, platform_id, api_name, time=None):
-        bot_user = await self._users_collection.find_one_and_update({
-            "id": platform_id, "platform": api_name},
-            {
-                "$push": {"requests_time": {"$each": [time]}},
-                "$unset": {"last_request_time": 1}
-            }, upsert=True)
+        self._request_log.record(platform_id, api_name, time)
+        bot_user = await self._get_profile(platform_id, api_name)
         if bot_user is None or not ("group_name" in bot_user or "professor_name" in bot_user):
             raise EmptyResponse
         return {
@@ -38,19 +109,45 @@ class MongoDB:
         }
 
     async def set_user_data(self, user_id, api_name, group_name=None, professor_name=None):
-        await self.set_check_changes_member(user_id, api_name, False)
-        await self._users_collection.find_one_and_delete({"id": user_id, "platform": api_name})
-        request = {"id": user_id, "platform": api_name}
-        if group_name:
-            request['group_name'] = group_name
-        elif professor_name:
-            request['professor_name'] = professor_name
-        await self._users_collection.insert_one(request)
-
-    async def get_mailing_subscribers_by_time(self, time: str) -> list:
-        cursor = self._users_collection.find({"mailing_time": time})
-        subscribers = await self._parse_response(cursor)
-        return list(map(lambda subscriber: [subscriber["id"], subscriber["platform"]], subscribers))
+        name_field = "group_name" if group_name else "professor_name" if professor_name else None
+        update = {
+            "$set": {"check_changes": False, **({name_field: group_name or professor_name} if name_field else {})},
+            "$unset": {field: 1 for field in ("group_name", "professor_name", "requests_time") if field != name_field}
+        }
+        previous = await self._users_collection.find_one_and_update(
+            {"id": user_id, "platform": api_name},
+            update,
+            {"_id": 0, "group_name": 1, "professor_name": 1, "mailing_time": 1, "check_changes": 1},
+            upsert=True
+        )
+        previous = previous or {}
+        previous_name = previous.get("group_name") or previous.get("professor_name")
+        if previous_name and previous.get("check_changes", True):
+            await self._groups_collection.bulk_write([
+                UpdateOne({"name": previous_name}, {"$pull": {"users": {"id": user_id, "platform": api_name}}}),
+                DeleteOne({"name": previous_name, "$or": [{"users": {"$size": 0}}, {"users": {"$exists": False}}]})
+            ])
+        self._profiles.set((api_name, user_id), {
+            **({name_field: update["$set"][name_field]} if name_field else {}),
+            **({"mailing_time": previous["mailing_time"]} if "mailing_time" in previous else {})
+        })
+        self._mailing_version += 1
+
+    async def _get_profile(self, user_id, api_name):
+        return await self._profiles.get_or_load(
+            (api_name, user_id),
+            lambda: self._users_collection.find_one(
+                {"id": user_id, "platform": api_name},
+                {"_id": 0, "group_name": 1, "professor_name": 1, "mailing_time": 1}
+            )
+        )
+
+    async def get_mailing_subscribers(self) -> list:
+        cursor = self._users_collection.find(
+            {"mailing_time": {"$exists": True}},
+            {"_id": 0, "id": 1, "platform": 1, "mailing_time": 1, "group_name": 1, "professor_name": 1}
+        )
+        return await self._parse_response(cursor)
 
     async def set_mailing_time(self, user_id, api_name, time=None):
         if time is None:
@@ -61,6 +158,11 @@ class MongoDB:
             "id": user_id,
             "platform": api_name,
         }, update_parameter)
+        profile = self._profiles.get((api_name, user_id))
+        if profile is not None:
+            profile = {key: value for key, value in profile.items() if key != "mailing_time"}
+            self._profiles.set((api_name, user_id), {**profile, "mailing_time": time} if time is not None else profile)
+        self._mailing_version += 1
 
     @staticmethod
     async def _parse_response(cursor):
@@ -79,14 +181,16 @@ class MongoDB:
         return (await self._groups_collection.find_one({"name": group}))['users']
 
     async def set_check_changes_member(self, user_id: int, api_name: str, check_changes=False) -> None:
-        user_data = await self._users_collection.find_one({"id": user_id, "platform": api_name})
+        user_data = await self._get_profile(user_id, api_name)
         if user_data is None or not ("group_name" in user_data or "professor_name" in user_data):
             return
-        user_id = user_data["id"]
-        chat_platform = user_data["platform"]
+        chat_platform = api_name
         request = {"users": {"id": user_id, "platform": chat_platform}}
         find_params = {"name": user_data['group_name'] if "group_name" in user_data else user_data['professor_name']}
 
+        await self._users_collection.update_one(
+            {"id": user_id, "platform": api_name}, {"$set": {"check_changes": check_changes}}
+        )
         if check_changes:
             await self._groups_collection.find_one_and_update(find_params, {"$addToSet": request}, upsert=True)
         else:
@@ -106,9 +210,12 @@ class MongoDB:
                resp['users'][0]['id'] == user_id and \
                resp['users'][0]['platform'] == user_chat_platform
 
-    async def get_group_hashes(self, group_name: str):
-        find_parameter = {"name": group_name}
-        return await self._groups_collection.find_one(find_parameter)
+    async def get_group_fingerprints(self, group_name: str):
+        group = await self._groups_collection.find_one({"name": group_name})
+        return group.get("fingerprints") if group else None
 
-    async def set_group_hashes(self, hashes: list, group_name: str):
-        await self._groups_collection.update_one({"name": group_name}, {"$set": {"hashes": hashes}})
+    async def set_group_fingerprints(self, fingerprints: dict, group_name: str):
+        await self._groups_collection.update_one(
+            {"name": group_name},
+            {"$set": {"fingerprints": fingerprints}, "$unset": {"hashes": 1}}
+        )
@@ -0,0 +1,205 @@
+import asyncio
+import json
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+from Exceptions.empty_response import EmptyResponse
+from Wrappers.abstract_storage import Storage
+from Wrappers.request_log import RequestLog
+
+
+class SQLite(Storage):
+    _schema = """
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER NOT NULL,
+            platform TEXT NOT NULL,
+            group_name TEXT,
+            professor_name TEXT,
+            mailing_time TEXT,
+            check_changes INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (id, platform)
+        );
+        CREATE INDEX IF NOT EXISTS users_mailing_time ON users (mailing_time) WHERE mailing_time IS NOT NULL;
+        CREATE TABLE IF NOT EXISTS groups (
+            name TEXT PRIMARY KEY,
+            fingerprints TEXT
+        );
+        CREATE TABLE IF NOT EXISTS group_members (
+            name TEXT NOT NULL,
+            id INTEGER NOT NULL,
+            platform TEXT NOT NULL,
+            PRIMARY KEY (name, id, platform)
+        );
+        CREATE TABLE IF NOT EXISTS requests (
+            platform TEXT NOT NULL,
+            id INTEGER NOT NULL,
+            hour TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (platform, id, hour)
+        );
+    """
+
+    def __init__(self, path: str = "schedule.db"):
+        super().__init__()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(self._schema)
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._request_log = RequestLog(self._write_requests)
+
+    async def get_status(self):
+        try:
+            await self._run(lambda: self._connection.execute("SELECT 1").fetchone())
+            return "working"
+        except sqlite3.Error as err:
+            return f"{err.__class__.__name__}: {err}"
+
+    async def audit_query_plans(self) -> dict:
+        queries = {
+            "get_user_data": ("SELECT * FROM users WHERE id = ? AND platform = ?", (0, "vk")),
+            "get_mailing_subscribers": ("SELECT * FROM users WHERE mailing_time IS NOT NULL", ()),
+            "get_check_changes_members": ("SELECT id, platform FROM group_members WHERE name = ?", ("",)),
+            "get_group_fingerprints": ("SELECT fingerprints FROM groups WHERE name = ?", ("",))
+        }
+        report = {}
+        for method_name, (query, parameters) in queries.items():
+            stages = [row["detail"] for row in await self._fetch_all(f"EXPLAIN QUERY PLAN {query}", parameters)]
+            report[method_name] = {"stages": stages, "collection scan": any(s.startswith("SCAN") for s in stages)}
+        return report
+
+    def get_request_log_status(self) -> dict:
+        return self._request_log.get_status()
+
+    async def flush_request_log(self) -> None:
+        await self._request_log.flush()
+
+    async def get_user_data(self, platform_id, api_name, time=None):
+        self._request_log.record(platform_id, api_name, time)
+        bot_user = await self._fetch_one(
+            "SELECT group_name, professor_name FROM users WHERE id = ? AND platform = ?", (platform_id, api_name)
+        )
+        if bot_user is None or not (bot_user["group_name"] or bot_user["professor_name"]):
+            raise EmptyResponse
+        return {
+            "group_name": bot_user["group_name"]
+        } if bot_user["group_name"] is not None else {
+            "professor_name": bot_user["professor_name"]
+        }
+
+    async def set_user_data(self, user_id, api_name, group_name=None, professor_name=None):
+        await self._run(
+            self._set_user_data, user_id, api_name, group_name or None, None if group_name else professor_name
+        )
+        self._mailing_version += 1
+
+    def _set_user_data(self, user_id, api_name, group_name, professor_name):
+        with self._connection:
+            previous = self._connection.execute(
+                "SELECT group_name, professor_name, check_changes FROM users WHERE id = ? AND platform = ?",
+                (user_id, api_name)
+            ).fetchone()
+            self._connection.execute(
+                "INSERT INTO users (id, platform, group_name, professor_name, check_changes) VALUES (?, ?, ?, ?, 0) "
+                "ON CONFLICT (id, platform) DO UPDATE SET "
+                "group_name = excluded.group_name, professor_name = excluded.professor_name, check_changes = 0",
+                (user_id, api_name, group_name, professor_name)
+            )
+            if previous is not None and previous["check_changes"]:
+                self._remove_group_member(previous["group_name"] or previous["professor_name"], user_id, api_name)
+
+    async def get_mailing_subscribers(self) -> list:
+        return [
+            {key: value for key, value in dict(row).items() if value is not None}
+            for row in await self._fetch_all(
+                "SELECT id, platform, mailing_time, group_name, professor_name FROM users "
+                "WHERE mailing_time IS NOT NULL"
+            )
+        ]
+
+    async def set_mailing_time(self, user_id, api_name, time=None):
+        await self._write(
+            "UPDATE users SET mailing_time = ? WHERE id = ? AND platform = ?", (time, user_id, api_name)
+        )
+        self._mailing_version += 1
+
+    async def get_groups_list(self) -> list:
+        return [row["name"] for row in await self._fetch_all("SELECT name FROM groups")]
+
+    async def get_check_changes_members(self, group: str) -> list:
+        return [dict(row) for row in await self._fetch_all(
+            "SELECT id, platform FROM group_members WHERE name = ?", (group,)
+        )]
+
+    async def set_check_changes_member(self, user_id: int, api_name: str, check_changes=False) -> None:
+        await self._run(self._set_check_changes_member, user_id, api_name, check_changes)
+
+    def _set_check_changes_member(self, user_id, api_name, check_changes):
+        with self._connection:
+            user_data = self._connection.execute(
+                "SELECT group_name, professor_name FROM users WHERE id = ? AND platform = ?", (user_id, api_name)
+            ).fetchone()
+            if user_data is None or not (user_data["group_name"] or user_data["professor_name"]):
+                return
+            name = user_data["group_name"] or user_data["professor_name"]
+            self._connection.execute(
+                "UPDATE users SET check_changes = ? WHERE id = ? AND platform = ?",
+                (int(check_changes), user_id, api_name)
+            )
+            if check_changes:
+                self._connection.execute("INSERT OR IGNORE INTO groups (name) VALUES (?)", (name,))
+                self._connection.execute(
+                    "INSERT OR IGNORE INTO group_members (name, id, platform) VALUES (?, ?, ?)",
+                    (name, user_id, api_name)
+                )
+            else:
+                self._remove_group_member(name, user_id, api_name)
+
+    def _remove_group_member(self, name, user_id, api_name):
+        self._connection.execute(
+            "DELETE FROM group_members WHERE name = ? AND id = ? AND platform = ?", (name, user_id, api_name)
+        )
+        self._connection.execute(
+            "DELETE FROM groups WHERE name = ? AND NOT EXISTS (SELECT 1 FROM group_members WHERE name = ?)",
+            (name, name)
+        )
+
+    async def get_group_fingerprints(self, group_name: str):
+        group = await self._fetch_one("SELECT fingerprints FROM groups WHERE name = ?", (group_name,))
+        return json.loads(group["fingerprints"]) if group and group["fingerprints"] else None
+
+    async def set_group_fingerprints(self, fingerprints: dict, group_name: str):
+        await self._write(
+            "UPDATE groups SET fingerprints = ? WHERE name = ?",
+            (json.dumps(fingerprints, ensure_ascii=False), group_name)
+        )
+
+    async def _write_requests(self, times_by_bucket: dict) -> list:
+        def write():
+            with self._connection:
+                self._connection.executemany(
+                    "INSERT INTO requests (platform, id, hour, count) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (platform, id, hour) DO UPDATE SET count = count + excluded.count",
+                    [
+                        (api_name, platform_id, hour.isoformat(), len(times))
+                        for (api_name, platform_id, hour), times in times_by_bucket.items()
+                    ]
+                )
+        await self._run(write)
+        return []
+
+    async def _fetch_one(self, query: str, parameters: tuple = ()):
+        return await self._run(lambda: self._connection.execute(query, parameters).fetchone())
+
+    async def _fetch_all(self, query: str, parameters: tuple = ()) -> list:
+        return await self._run(lambda: self._connection.execute(query, parameters).fetchall())
+
+    async def _write(self, query: str, parameters: tuple = ()) -> None:
+        def write():
+            with self._connection:
+                self._connection.execute(query, parameters)
+        await self._run(write)
+
+    async def _run(self, function, *args):
+        return await asyncio.get_event_loop().run_in_executor(self._executor, function, *args)
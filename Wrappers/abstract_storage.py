@@ -0,0 +1,51 @@
+class Storage:
+    def __init__(self):
+        self._mailing_version = 0
+
+    async def get_status(self) -> str:
+        pass
+
+    async def ensure_indexes(self) -> None:
+        pass
+
+    async def audit_query_plans(self) -> dict:
+        return {}
+
+    def get_request_log_status(self) -> dict:
+        return {}
+
+    async def flush_request_log(self) -> None:
+        pass
+
+    def get_profile_cache_status(self) -> dict:
+        return {}
+
+    def get_mailing_version(self) -> int:
+        return self._mailing_version
+
+    async def get_user_data(self, platform_id, api_name, time=None) -> dict:
+        pass
+
+    async def set_user_data(self, user_id, api_name, group_name=None, professor_name=None) -> None:
+        pass
+
+    async def get_mailing_subscribers(self) -> list:
+        pass
+
+    async def set_mailing_time(self, user_id, api_name, time=None) -> None:
+        pass
+
+    async def get_groups_list(self) -> list:
+        pass
+
+    async def get_check_changes_members(self, group: str) -> list:
+        pass
+
+    async def set_check_changes_member(self, user_id: int, api_name: str, check_changes=False) -> None:
+        pass
+
+    async def get_group_fingerprints(self, group_name: str):
+        pass
+
+    async def set_group_fingerprints(self, fingerprints: dict, group_name: str) -> None:
+        pass
@@ -0,0 +1,68 @@
+import asyncio
+from datetime import datetime
+
+
+class RequestLog:
+    def __init__(self, write_batch, max_batch: int = 500, flush_interval: float = 5, max_buffer: int = 20000):
+        self._write_batch = write_batch
+        self._max_batch = max_batch
+        self._flush_interval = flush_interval
+        self._max_buffer = max_buffer
+        self._buffer = []
+        self._flushing = None
+        self._flush_process = None
+        self._metrics = {"recorded": 0, "written": 0, "dropped": 0, "flushes": 0, "failed flushes": 0}
+
+    def get_status(self) -> dict:
+        return {"buffered": len(self._buffer), **self._metrics}
+
+    def record(self, platform_id, api_name: str, time: datetime = None) -> None:
+        if self._flush_process is None:
+            self._flush_process = asyncio.ensure_future(self._flushing_process())
+        self._buffer.append((api_name, platform_id, time or datetime.now()))
+        self._metrics["recorded"] += 1
+        self._trim()
+        if len(self._buffer) >= self._max_batch and (self._flushing is None or self._flushing.done()):
+            self._flushing = asyncio.ensure_future(self.flush())
+
+    async def flush(self) -> None:
+        while self._buffer:
+            batch, self._buffer = self._buffer, []
+            try:
+                failed_buckets = set(await self._write_batch(self.get_buckets(batch)) or ())
+            except Exception as err:
+                print(f"{err.__class__.__name__}: {err}")
+                self._metrics["failed flushes"] += 1
+                self._buffer = batch + self._buffer
+                self._trim()
+                return
+            failed = [entry for entry in batch if self._get_bucket_key(*entry) in failed_buckets]
+            self._metrics["written"] += len(batch) - len(failed)
+            self._metrics["flushes"] += 1
+            if failed:
+                self._metrics["failed flushes"] += 1
+                self._buffer = failed + self._buffer
+                self._trim()
+                return
+
+    def _trim(self) -> None:
+        if len(self._buffer) > self._max_buffer:
+            self._metrics["dropped"] += len(self._buffer) - self._max_buffer
+            del self._buffer[:len(self._buffer) - self._max_buffer]
+
+    async def _flushing_process(self) -> None:
+        while True:
+            await asyncio.sleep(self._flush_interval)
+            if self._flushing is None or self._flushing.done():
+                self._flushing = asyncio.ensure_future(self.flush())
+
+    @staticmethod
+    def get_buckets(batch: list) -> dict:
+        times_by_bucket = {}
+        for api_name, platform_id, time in batch:
+            times_by_bucket.setdefault(RequestLog._get_bucket_key(api_name, platform_id, time), []).append(time)
+        return times_by_bucket
+
+    @staticmethod
+    def _get_bucket_key(api_name: str, platform_id, time) -> tuple:
+        return api_name, platform_id, time.replace(minute=0, second=0, microsecond=0)
@@ -6,8 +6,8 @@ from aiohttp import web
 import tokens
 from APIs.Chsu.client import Chsu
 from APIs.Telegram.client import Telegram
+from APIs.Telegram.webhook_reply import WebhookReply
 from APIs.Vk.client import Vk
-from APIs.abstract_messanger import Messanger
 
 from Handlers.Events.admins_message_event import AdminsMessageHandler
 from Handlers.Events.another_event import AnotherEventHandler
@@ -33,9 +33,13 @@ from Handlers.Events.unsubscribe_event import UnsubscribeHandler
 from Handlers.Events.user_message_event import UserMessageHandler
 from Handlers.date_handler import DateHandler
 
+from Handlers.event_supervisor import EventSupervisor
+from Handlers.mailing_scheduler import MailingScheduler
+from Handlers.router import Router
 from Handlers.schedule_change_checker import ScheduleChecker
 
 from Wrappers.MongoDb.database import MongoDB
+from Wrappers.SQLite.database import SQLite
 
 routes = web.RouteTableDef()
 event_loop = asyncio.get_event_loop()
@@ -49,14 +53,27 @@ async def index(request):
         "Server start datetime:": start_time.strftime("%d.%m.%Y %H:%M:%S.%f"),
         "Server uptime:": str(date_handler.get_current_date_object() - start_time),
         f'CHSU API': f'{await chsu_api.get_status()}',
-        f'Database': f'{await mongo_db_api.get_status()}',
+        f'Timetable': chsu_api.get_cache_status(),
+        f'CHSU auth': chsu_api.get_auth_status(),
+        f'CHSU HTTP': chsu_api.get_http_status(),
+        f'Database': f'{await storage_api.get_status()}',
+        f'Request log': storage_api.get_request_log_status(),
+        f'Profile cache': storage_api.get_profile_cache_status(),
         f'VK': f'{await vk_api.get_status()}',
+        f'VK execute queue': vk_api.get_queue_status(),
+        f'VK dispatcher': vk_api.get_dispatcher_status(),
         f'Telegram': {
             'is working': await telegram_api.get_status(),
-            'is set webhook': await telegram_api.get_webhook() != ""
+            'is set webhook': await telegram_api.get_webhook() != "",
+            'dispatcher': telegram_api.get_dispatcher_status(),
+            'http': telegram_api.get_http_status(),
+            'webhook replies': WebhookReply.get_status()
         },
-        f'Mailing': f"{'not ' if mailing.done() else ''}working",
-        f'Update checking': checker.get_status()
+        f'Mailing': mailing.get_status(),
+        f'Routes': router.get_status(),
+        f'Events': supervisor.get_status(),
+        f'Update checking': checker.get_status(),
+        f'Last sweep': checker.get_sweep_report()
     }))
 
 
@@ -67,17 +84,19 @@ async def vk_event(request):
         return web.Response(text=request.match_info['returnable'])
     elif data["type"] == "message_event":
         event = {
+            'platform': vk_api.get_name(),
             'from_id': data['object']['peer_id'],
             'payload': data['object']['payload']['address'],
             'event_id': data['object']["event_id"]
         }
     else:
         event = {
+            'platform': vk_api.get_name(),
             'from_id': data['object']['message']['from_id'],
             'text': data['object']['message']['text']
         }
     if "X-Retry-Counter" not in request.headers:
-        event_loop.create_task(vk_handler.handle_event(event))
+        supervisor.submit(event)
     return web.Response(text="ok")
 
 
@@ -100,19 +119,27 @@ async def telegram_event(request):
     try:
         if 'message' in data:
             event = {
+                "platform": telegram_api.get_name(),
                 "from_id": data['message']['from']['id'],
                 "text": data['message']['text'],
             }
         elif 'callback_query' in data:
             event = {
+                "platform": telegram_api.get_name(),
                 "from_id": data['callback_query']['from']['id'],
                 "payload": data['callback_query']['data'],
                 'event_id': data['callback_query']["id"]
             }
         else:
             event = None
-        event_loop.create_task(telegram_handler.handle_event(event))
-        return web.Response(text="ok")
+        if event is None or not telegram_api.is_inline_replies():
+            supervisor.submit(event)
+            return web.Response(text="ok")
+        webhook_reply = WebhookReply(event['from_id'])
+        body = await webhook_reply.get_response(webhook_reply.start(lambda: supervisor.submit(event)))
+        if body is None:
+            return web.Response(text="ok")
+        return web.Response(body=body, content_type="application/json")
     except KeyError:
         return web.Response(text="ok")
 
@@ -136,54 +163,44 @@ async def delete_webhook(request):
     return web.Response(text='ok')
 
 
-async def mailing():
-    while date_handler.get_current_date_object().second != 0:
-        await asyncio.sleep(.5)
-    print(f'Mailing started at: {date_handler.get_current_date_object().strftime("%d.%m.%Y %H:%M:%S.%f")}')
-    while True:
-        users = await mongo_db_api.get_mailing_subscribers_by_time(
-            date_handler.get_current_date_object().strftime("%H:%M")
-        )
-        for user in users:
-            event = {"from_id": user[0], "text": "Расписание на завтра", 'time': date_handler.get_current_date_object()}
-            if user[1] == telegram_api.get_name():
-                await telegram_handler.handle_event(event)
-            elif user[1] == vk_api.get_name():
-                await vk_handler.handle_event(event)
-        await asyncio.sleep(60)
-
-
-def get_responsibility_chain(m: Messanger):
-    params = (m, mongo_db_api, chsu_api)
-    handler = CallbackHandler(*params)
-    handler.set_next(StartHandler(*params)) \
-        .set_next(SettingsHandler(*params)) \
-        .set_next(CancelHandler(*params)) \
- \
-        .set_next(ChangeGroupHandler(*params)) \
-        .set_next(ChooseGroupHandler(*params)) \
-        .set_next(ChooseProfessorHandler(*params)) \
-        .set_next(GroupOrProfessorNameHandler(*params)) \
-\
-        .set_next(AdminsMessageHandler(*params)) \
-        .set_next(UserMessageHandler(*params)) \
-\
-        .set_next(ScheduleChangesHandler(*params)) \
-        .set_next(SetCheckChangesHandler(*params)) \
-        .set_next(UnsetCheckChangesHandler(*params)) \
-\
-        .set_next(ScheduleForAnotherDayHandler(*params)) \
-        .set_next(ScheduleForTomorrowHandler(*params)) \
-        .set_next(ScheduleForTodayHandler(*params)) \
-        .set_next(DoubleDateHandler(*params)) \
-        .set_next(SingleDateHandler(*params)) \
-\
-        .set_next(TimeStampHandler(*params)) \
-        .set_next(UnsubscribeHandler(*params)) \
-        .set_next(MailingHandler(*params)) \
-\
-        .set_next(AnotherEventHandler(*params))
-    return handler
+def get_router(messangers: list):
+    params = (messangers, storage_api, chsu_api)
+    return Router([
+        CallbackHandler(*params),
+        StartHandler(*params),
+        SettingsHandler(*params),
+        CancelHandler(*params),
+
+        ChangeGroupHandler(*params),
+        ChooseGroupHandler(*params),
+        ChooseProfessorHandler(*params),
+        GroupOrProfessorNameHandler(*params),
+
+        AdminsMessageHandler(*params),
+        UserMessageHandler(*params),
+
+        ScheduleChangesHandler(*params),
+        SetCheckChangesHandler(*params),
+        UnsetCheckChangesHandler(*params),
+
+        ScheduleForAnotherDayHandler(*params),
+        ScheduleForTomorrowHandler(*params),
+        ScheduleForTodayHandler(*params),
+        DoubleDateHandler(*params),
+        SingleDateHandler(*params),
+
+        TimeStampHandler(*params),
+        UnsubscribeHandler(*params),
+        MailingHandler(*params),
+
+        AnotherEventHandler(*params)
+    ])
+
+
+def get_storage():
+    if getattr(tokens, "STORAGE", "mongodb") == "sqlite":
+        return SQLite(getattr(tokens, "SQLITE_PATH", "schedule.db"))
+    return MongoDB(tokens.MONGO_DB_LOGIN, tokens.MONGO_DB_PASSWORD, tokens.MONGO_DB_NAME)
 
 
 if __name__ == "__main__":
@@ -191,24 +208,26 @@ if __name__ == "__main__":
     # init services
     print("Starting services...")
     chsu_api = Chsu(event_loop)
-    mongo_db_api = MongoDB(tokens.MONGO_DB_LOGIN, tokens.MONGO_DB_PASSWORD, tokens.MONGO_DB_NAME)
+    storage_api = get_storage()
+    event_loop.run_until_complete(storage_api.ensure_indexes())
+    print(f"Query plans: {event_loop.run_until_complete(storage_api.audit_query_plans())}")
     date_handler = DateHandler()
     print("Done")
 
     # init messangers
     print("Starting messangers...")
     vk_api = Vk(tokens.VK_API, event_loop)
-    vk_handler = get_responsibility_chain(vk_api)
-    telegram_api = Telegram(tokens.TELEGRAM_API, event_loop)
-    telegram_handler = get_responsibility_chain(telegram_api)
+    telegram_api = Telegram(tokens.TELEGRAM_API, event_loop, getattr(tokens, "TELEGRAM_INLINE_REPLIES", False))
+    router = get_router([vk_api, telegram_api])
+    supervisor = EventSupervisor(router, [vk_api, telegram_api], event_loop)
     print("Done")
 
     # init mailing
     print("Starting mailing...")
-    mailing = event_loop.create_task(mailing())
+    mailing = MailingScheduler(vk_api, telegram_api, storage_api, chsu_api, event_loop)
 
     print("Starting schedule checker...")
-    checker = ScheduleChecker(vk_api, telegram_api, mongo_db_api, chsu_api, event_loop)
+    checker = ScheduleChecker(vk_api, telegram_api, storage_api, chsu_api, event_loop)
     print("Done")
 
     start_time = date_handler.get_current_date_object()
@@ -218,4 +237,5 @@ if __name__ == "__main__":
     print("Starting web app...")
     app = web.Application()
     app.add_routes(routes)
+    app.on_shutdown.append(lambda _: storage_api.flush_request_log())
     web.run_app(app, port=8080, host="127.0.0.1", loop=event_loop)